@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -85,6 +86,29 @@ DATABASES = {
     }
 }
 
+# Set POSTGRES_DB to use PostgreSQL (requires psycopg2); JSONField columns
+# such as statistics_data are then stored as jsonb
+if os.environ.get('POSTGRES_DB'):
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ['POSTGRES_DB'],
+        'USER': os.environ.get('POSTGRES_USER', 'postgres'),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        'CONN_MAX_AGE': 60,
+    }
+
+# Set REDIS_URL (e.g. redis://localhost:6379/0, requires redis) to share the
+# response cache between worker processes instead of one cache per process
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -137,7 +161,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'datasets.renderers.FastJSONRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20
@@ -172,8 +196,15 @@ CORS_ALLOWED_ORIGINS = [
 CORS_ALLOW_ALL_ORIGINS = True  # Only for development
 
 # File upload settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
+# Largest dataset file accepted by the upload endpoints
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10MB
+
+# Uploads larger than this are streamed to a temporary file instead of RAM;
+# MAX_UPLOAD_BYTES itself is enforced by the upload serializers
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
+DATASET_PROCESSING_WORKERS = 2  # Threads processing ?async=true uploads
+CHUNKED_UPLOAD_EXPIRATION = timedelta(days=1)  # Unfinished chunked uploads expire after this
 # History Management Settings
 MAX_DATASETS_PER_USER = 5  # Keep only last 5 datasets per user
 
@@ -181,5 +212,11 @@ MAX_DATASETS_PER_USER = 5  # Keep only last 5 datasets per user
 MEDIA_ROOT = BASE_DIR / 'media'
 MEDIA_URL = '/media/'
 
+# Set when nginx serves MEDIA_ROOT from an internal location, e.g.
+#   location /protected/ { internal; alias /path/to/media/; }
+# so dataset downloads are sent by the proxy instead of a Django worker
+USE_X_ACCEL_REDIRECT = False
+PROTECTED_MEDIA_URL = '/protected/'
+
 # Static files for PDF generation
 STATIC_ROOT = BASE_DIR / 'staticfiles'
\ No newline at end of file
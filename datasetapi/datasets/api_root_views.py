@@ -27,6 +27,7 @@ def api_root(request):
             'datasets': {
                 'list_datasets': f'{base_url}/api/datasets/',
                 'upload_dataset': f'{base_url}/api/datasets/upload/',
+                'chunked_upload': f'{base_url}/api/datasets/chunked-upload/',
                 'dataset_detail': f'{base_url}/api/datasets/{{id}}/',
                 'dataset_statistics': f'{base_url}/api/datasets/{{id}}/statistics/',
                 'dataset_columns': f'{base_url}/api/datasets/{{id}}/columns/',
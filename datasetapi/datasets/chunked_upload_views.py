@@ -0,0 +1,290 @@
+"""
+Resumable chunked upload views
+
+A file is sent as a series of PUT requests that each carry one chunk and a
+Content-Range header, so an interrupted upload resumes from the offset the
+server reports instead of starting over. Completing the upload verifies the
+optional MD5 checksum and hands the file to background dataset processing,
+unless an identical file has already been processed. Expired uploads are
+removed by the purge_chunked_uploads management command.
+
+    PUT  /api/datasets/chunked-upload/                        first chunk
+    PUT  /api/datasets/chunked-upload/{upload_id}/            next chunk
+    GET  /api/datasets/chunked-upload/{upload_id}/            current offset
+    POST /api/datasets/chunked-upload/{upload_id}/complete/   start processing
+"""
+import os
+import re
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, parser_classes
+from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.response import Response
+
+from .models import ChunkedUpload
+from .serializers import ALLOWED_UPLOAD_EXTENSIONS, DatasetListSerializer
+from .tasks import enqueue_dataset_processing
+from .utils import create_pending_dataset, find_duplicate_dataset, hash_file
+
+CONTENT_RANGE_PATTERN = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+def parse_content_range(request):
+    """
+    Parse a 'bytes start-end/total' Content-Range header
+
+    Returns:
+        tuple: (start, end, total), or None if the header is missing or invalid
+    """
+    match = CONTENT_RANGE_PATTERN.match(request.META.get('HTTP_CONTENT_RANGE', ''))
+    if not match:
+        return None
+    start, end, total = (int(value) for value in match.groups())
+    if start > end or end >= total:
+        return None
+    return start, end, total
+
+
+def upload_status(upload):
+    """JSON state of a chunked upload returned to the client"""
+    return {
+        'upload_id': str(upload.upload_id),
+        'file_name': upload.file_name,
+        'offset': upload.offset,
+        'total_size': upload.total_size,
+        'expires': (upload.created_date + settings.CHUNKED_UPLOAD_EXPIRATION).isoformat()
+    }
+
+
+def discard_upload(upload):
+    """Delete a chunked upload and its partial file"""
+    default_storage.delete(upload.storage_path)
+    upload.delete()
+
+
+def get_active_upload(upload_id):
+    """
+    Get a chunked upload that has not expired
+
+    Expired uploads are discarded and reported as not found.
+    """
+    upload = get_object_or_404(ChunkedUpload, upload_id=upload_id)
+    if upload.created_date + settings.CHUNKED_UPLOAD_EXPIRATION < timezone.now():
+        discard_upload(upload)
+        return None
+    return upload
+
+
+def chunk_size_error(chunk, start, end):
+    """400 response when a chunk's size does not match its Content-Range, else None"""
+    if chunk.size != end - start + 1:
+        return Response({
+            'error': 'Chunk size does not match Content-Range'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    return None
+
+
+def append_chunk(upload, chunk, start, end):
+    """Write a chunk at upload.offset and return the updated status"""
+    part_path = default_storage.path(upload.storage_path)
+    os.makedirs(os.path.dirname(part_path), exist_ok=True)
+    stored_size = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+    # Bytes counted in the offset are missing; the client resumes from the file
+    if stored_size < upload.offset:
+        upload.offset = stored_size
+        upload.save(update_fields=['offset', 'updated_date'])
+        return Response({
+            'error': 'Stored file is shorter than the upload offset',
+            **upload_status(upload)
+        }, status=status.HTTP_409_CONFLICT)
+
+    # Bytes past the offset are left by a write whose offset update was lost,
+    # so the chunk overwrites them instead of being appended after them
+    with open(part_path, 'r+b' if stored_size else 'wb') as part_file:
+        part_file.seek(start)
+        for piece in chunk.chunks():
+            part_file.write(piece)
+        part_file.truncate()
+
+    upload.offset = end + 1
+    upload.save(update_fields=['offset', 'updated_date'])
+
+    return Response(upload_status(upload), status=status.HTTP_200_OK)
+
+
+@api_view(['PUT'])
+@parser_classes([MultiPartParser, FormParser])
+def chunked_upload_start(request):
+    """
+    Start a chunked upload with its first chunk
+
+    PUT /api/datasets/chunked-upload/
+    Content-Range: bytes 0-{n-1}/{total}
+
+    Form data:
+        file: First chunk of the file
+        filename: Original file name (defaults to the chunk's name)
+    """
+    chunk = request.FILES.get('file')
+    content_range = parse_content_range(request)
+    if chunk is None or content_range is None:
+        return Response({
+            'error': 'A file chunk and a valid Content-Range header are required'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    start, end, total = content_range
+    if start != 0:
+        return Response({
+            'error': 'The first chunk must start at byte 0'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    size_error = chunk_size_error(chunk, start, end)
+    if size_error is not None:
+        return size_error
+
+    file_name = os.path.basename(request.data.get('filename') or chunk.name)
+    if os.path.splitext(file_name)[1].lower() not in ALLOWED_UPLOAD_EXTENSIONS:
+        return Response({
+            'error': f"File type not supported. Allowed types: {', '.join(sorted(ALLOWED_UPLOAD_EXTENSIONS))}"
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if total > settings.MAX_UPLOAD_BYTES:
+        return Response({
+            'error': f"File size cannot exceed {settings.MAX_UPLOAD_BYTES // (1024 * 1024)}MB"
+        }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    # The row is only kept once its first chunk has been written
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.create(file_name=file_name, total_size=total)
+        return append_chunk(upload, chunk, start, end)
+
+
+@api_view(['GET', 'PUT'])
+@parser_classes([MultiPartParser, FormParser])
+def chunked_upload_detail(request, upload_id):
+    """
+    Get the offset of a chunked upload, or append its next chunk
+
+    GET /api/datasets/chunked-upload/{upload_id}/
+    PUT /api/datasets/chunked-upload/{upload_id}/
+    Content-Range: bytes {offset}-{offset+n-1}/{total}
+    """
+    upload = get_active_upload(upload_id)
+    if upload is None:
+        return Response({
+            'error': 'Upload has expired'
+        }, status=status.HTTP_410_GONE)
+
+    if request.method == 'GET':
+        return Response(upload_status(upload), status=status.HTTP_200_OK)
+
+    chunk = request.FILES.get('file')
+    content_range = parse_content_range(request)
+    if chunk is None or content_range is None:
+        return Response({
+            'error': 'A file chunk and a valid Content-Range header are required'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    start, end, total = content_range
+    if total != upload.total_size:
+        return Response({
+            'error': 'Content-Range total does not match the upload size'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    size_error = chunk_size_error(chunk, start, end)
+    if size_error is not None:
+        return size_error
+
+    # On databases with row locks (PostgreSQL) a retried chunk waits here and
+    # then sees the offset the first attempt stored. SQLite ignores
+    # select_for_update; there concurrent retries of a chunk both write the
+    # same bytes at the same position, which append_chunk makes harmless.
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+
+        # Chunks must arrive in order; the client resumes from the reported offset
+        if start != upload.offset:
+            return Response({
+                'error': 'Chunk does not start at the current offset',
+                **upload_status(upload)
+            }, status=status.HTTP_409_CONFLICT)
+
+        return append_chunk(upload, chunk, start, end)
+
+
+@api_view(['POST'])
+def chunked_upload_complete(request, upload_id):
+    """
+    Finish a chunked upload and process it as a new dataset
+
+    POST /api/datasets/chunked-upload/{upload_id}/complete/
+
+    Form/JSON data:
+        md5: Optional hex MD5 of the whole file, verified before processing
+        name: Optional dataset name
+        description: Optional dataset description
+    """
+    upload = get_active_upload(upload_id)
+    if upload is None:
+        return Response({
+            'error': 'Upload has expired'
+        }, status=status.HTTP_410_GONE)
+
+    expected_md5 = request.data.get('md5')
+    if expected_md5 is not None and not isinstance(expected_md5, str):
+        return Response({
+            'error': 'md5 must be a hex string'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    # A concurrent or retried complete waits on the row lock and then finds
+    # the row deleted (404), so the upload becomes at most one dataset
+    with transaction.atomic():
+        upload = get_object_or_404(ChunkedUpload.objects.select_for_update(), pk=upload.pk)
+
+        if not upload.is_complete:
+            return Response({
+                'error': 'Upload is not complete',
+                **upload_status(upload)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        with default_storage.open(upload.storage_path, 'rb') as stored_file:
+            checksum_ok = not expected_md5 or hash_file(stored_file, 'md5') == expected_md5.lower()
+
+            # An identical file that was already processed is not processed again
+            file_sha256 = hash_file(stored_file) if checksum_ok else ''
+            duplicate = find_duplicate_dataset(file_sha256) if checksum_ok else None
+            if checksum_ok and duplicate is None:
+                dataset = create_pending_dataset(
+                    file_obj=stored_file,
+                    file_name=upload.file_name,
+                    name=request.data.get('name'),
+                    description=request.data.get('description'),
+                    file_sha256=file_sha256,
+                    upload_path=upload.storage_path
+                )
+
+        if not checksum_ok:
+            discard_upload(upload)
+            return Response({
+                'error': 'Checksum mismatch, upload discarded'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if duplicate is not None:
+            discard_upload(upload)
+            response_data = DatasetListSerializer(duplicate).data
+            response_data.update(is_duplicate=True, duplicate_of=duplicate.pk)
+            return Response(response_data, status=status.HTTP_200_OK)
+
+        # The background task removes the assembled file once processed;
+        # it is only queued after the row deletion commits
+        upload.delete()
+        enqueue_dataset_processing(dataset.pk, dataset.upload_path)
+
+    serializer = DatasetListSerializer(dataset)
+    return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
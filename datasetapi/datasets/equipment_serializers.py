@@ -3,6 +3,7 @@ Equipment-specific serializers for CSV upload and data summary APIs
 """
 from rest_framework import serializers
 from .models import Dataset, SummaryStatistics
+from .serializers import validate_upload_size
 
 
 class EquipmentCSVUploadSerializer(serializers.Serializer):
@@ -15,9 +16,8 @@ class EquipmentCSVUploadSerializer(serializers.Serializer):
     
     def validate_file(self, value):
         """Validate uploaded CSV file"""
-        # Check file size (10MB limit)
-        if value.size > 10 * 1024 * 1024:
-            raise serializers.ValidationError("File size cannot exceed 10MB")
+        # Check file size before anything reads the contents
+        validate_upload_size(value)
         
         # Check file extension
         if not value.name.lower().endswith('.csv'):
@@ -51,13 +51,14 @@ class EquipmentSummarySerializer(serializers.ModelSerializer):
         
         summary = {}
         for metric in ['flowrate', 'pressure', 'temperature']:
-            if metric in operational_metrics:
+            metric_data = operational_metrics.get(metric)
+            if metric_data is not None:
                 summary[metric] = {
-                    'average': operational_metrics[metric].get('average'),
-                    'min': operational_metrics[metric].get('min'),
-                    'max': operational_metrics[metric].get('max'),
-                    'count': operational_metrics[metric].get('count'),
-                    'missing_count': operational_metrics[metric].get('missing_count', 0)
+                    'average': metric_data.get('average'),
+                    'min': metric_data.get('min'),
+                    'max': metric_data.get('max'),
+                    'count': metric_data.get('count'),
+                    'missing_count': metric_data.get('missing_count', 0)
                 }
         
         return summary
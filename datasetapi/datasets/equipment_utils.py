@@ -7,6 +7,8 @@ import numpy as np
 from typing import Dict, Any, List, Tuple, Optional
 from django.core.exceptions import ValidationError
 
+from .utils import dataframe_to_records, read_csv_file
+
 
 # Required columns for equipment CSV files
 REQUIRED_COLUMNS = {
@@ -47,21 +49,21 @@ def validate_csv_columns(df: pd.DataFrame) -> Dict[str, Any]:
         'errors': []
     }
     
-    # Convert column names to lowercase for case-insensitive matching
-    df_columns_lower = [col.lower().strip() for col in df.columns]
+    # Lowercased column name -> actual column name (first occurrence wins)
+    lower_index = {}
+    for col in df.columns:
+        lower_index.setdefault(str(col).lower().strip(), col)
     
     # Check for required columns
     for required_field, possible_names in REQUIRED_COLUMNS.items():
-        found = False
-        for possible_name in possible_names:
-            if possible_name.lower() in df_columns_lower:
-                # Find the actual column name (with original case)
-                actual_column = df.columns[df_columns_lower.index(possible_name.lower())]
-                validation_result['column_mapping'][required_field] = actual_column
-                found = True
-                break
+        actual_column = next(
+            (lower_index[name.lower()] for name in possible_names if name.lower() in lower_index),
+            None
+        )
         
-        if not found:
+        if actual_column is not None:
+            validation_result['column_mapping'][required_field] = actual_column
+        else:
             validation_result['missing_columns'].append(required_field)
             validation_result['errors'].append(
                 f"Required column '{required_field}' not found. "
@@ -70,11 +72,12 @@ def validate_csv_columns(df: pd.DataFrame) -> Dict[str, Any]:
     
     # Check for optional columns
     for optional_field, possible_names in OPTIONAL_COLUMNS.items():
-        for possible_name in possible_names:
-            if possible_name.lower() in df_columns_lower:
-                actual_column = df.columns[df_columns_lower.index(possible_name.lower())]
-                validation_result['column_mapping'][optional_field] = actual_column
-                break
+        actual_column = next(
+            (lower_index[name.lower()] for name in possible_names if name.lower() in lower_index),
+            None
+        )
+        if actual_column is not None:
+            validation_result['column_mapping'][optional_field] = actual_column
     
     # Set validation status
     validation_result['is_valid'] = len(validation_result['missing_columns']) == 0
@@ -240,7 +243,7 @@ def process_equipment_csv(file_obj, file_name: str) -> Tuple[pd.DataFrame, Dict[
     """
     try:
         # Read CSV file
-        df = pd.read_csv(file_obj)
+        df = read_csv_file(file_obj)
         
         if df.empty:
             raise ValidationError("CSV file is empty")
@@ -291,19 +294,7 @@ def get_equipment_data_preview(df: pd.DataFrame, rows: int = 5) -> Dict[str, Any
     preview_df = df.head(rows)
     
     # Convert to JSON-serializable format
-    preview_data = []
-    for _, row in preview_df.iterrows():
-        row_data = {}
-        for col in preview_df.columns:
-            value = row[col]
-            # Handle NaN and other non-serializable values
-            if pd.isna(value):
-                row_data[col] = None
-            elif isinstance(value, (np.integer, np.floating)):
-                row_data[col] = float(value) if np.isfinite(value) else None
-            else:
-                row_data[col] = str(value)
-        preview_data.append(row_data)
+    preview_data = dataframe_to_records(preview_df)
     
     return {
         'columns': preview_df.columns.tolist(),
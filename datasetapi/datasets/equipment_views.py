@@ -7,7 +7,9 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils import timezone
+from io import BytesIO
 import pandas as pd
 
 from .models import Dataset, SummaryStatistics, DatasetColumn
@@ -23,6 +25,33 @@ from .equipment_utils import (
 from .history_utils import trigger_cleanup_if_needed
 
 
+def build_dataset_summary(dataset, summary):
+    """
+    Build the detailed equipment summary of one dataset
+    
+    Shared by the summary endpoint and uploads sent with ?return=summary.
+    """
+    return {
+        'total_record_count': summary.total_records,
+        'average_flowrate': summary.avg_flowrate,
+        'average_pressure': summary.avg_pressure,
+        'average_temperature': summary.avg_temperature,
+        'equipment_type_distribution': summary.equipment_type_distribution,
+        'operational_metrics': summary.statistics_data.get('operational_metrics', {}),
+        'data_quality': summary.statistics_data.get('data_quality', {}),
+        'equipment_analysis': summary.statistics_data.get('equipment_analysis', {}),
+        'dataset_info': {
+            'id': dataset.id,
+            'name': dataset.name,
+            'description': dataset.description,
+            'upload_date': dataset.upload_date,
+            'total_rows': dataset.total_rows,
+            'total_columns': dataset.total_columns
+        },
+        'analysis_timestamp': summary.updated_date
+    }
+
+
 @api_view(['POST'])
 @parser_classes([MultiPartParser, FormParser])
 def equipment_csv_upload(request):
@@ -30,6 +59,10 @@ def equipment_csv_upload(request):
     API endpoint for uploading equipment CSV files with validation
     
     POST /api/equipment/upload/
+    POST /api/equipment/upload/?return=summary
+    
+    With return=summary the response carries the full data summary of the
+    new dataset, as returned by /api/equipment/summary/{dataset_id}/.
     
     Expected CSV columns (case-insensitive):
     - equipment_id (or id, equipment_number)
@@ -65,20 +98,6 @@ def equipment_csv_upload(request):
         # Process the equipment CSV
         cleaned_df, summary_stats = process_equipment_csv(file_obj, file_obj.name)
         
-        # Create dataset instance
-        dataset = Dataset.objects.create(
-            name=name,
-            description=description,
-            file_name=file_obj.name,
-            file_size=file_obj.size,
-            file_type='csv',
-            total_rows=len(cleaned_df),
-            total_columns=len(cleaned_df.columns),
-            column_names=list(cleaned_df.columns),
-            column_types={col: str(cleaned_df[col].dtype) for col in cleaned_df.columns},
-            is_processed=True
-        )
-        
         # Extract equipment-specific metrics for quick access
         operational_metrics = summary_stats.get('operational_metrics', {})
         equipment_analysis = summary_stats.get('equipment_analysis', {})
@@ -128,51 +147,75 @@ def equipment_csv_upload(request):
                 }
             }
         
-        # Create summary statistics
-        summary = SummaryStatistics.objects.create(
-            dataset=dataset,
-            statistics_data=json_stats,
-            numeric_columns_count=len([col for col in cleaned_df.columns if cleaned_df[col].dtype in ['int64', 'float64']]),
-            categorical_columns_count=len([col for col in cleaned_df.columns if cleaned_df[col].dtype == 'object']),
-            missing_values_count=int(cleaned_df.isnull().sum().sum()),
-            total_records=len(cleaned_df),
-            avg_flowrate=operational_metrics.get('flowrate', {}).get('average'),
-            avg_pressure=operational_metrics.get('pressure', {}).get('average'),
-            avg_temperature=operational_metrics.get('temperature', {}).get('average'),
-            equipment_type_distribution=make_json_serializable(equipment_analysis.get('equipment_type_distribution', {}))
-        )
-        
-        # Create column records
+        # Build column records
+        column_fields = []
         for idx, column in enumerate(cleaned_df.columns):
             col_data = cleaned_df[column]
-            
-            column_obj = DatasetColumn.objects.create(
-                dataset=dataset,
-                name=column,
-                data_type=str(col_data.dtype),
-                position=idx,
-                non_null_count=int(col_data.count()),
-                null_count=int(col_data.isnull().sum()),
-                unique_count=int(col_data.nunique())
-            )
+            fields = {
+                'name': column,
+                'data_type': str(col_data.dtype),
+                'position': idx,
+                'non_null_count': int(col_data.count()),
+                'null_count': int(col_data.isnull().sum()),
+                'unique_count': int(col_data.nunique())
+            }
             
             # Add numeric-specific fields
             if pd.api.types.is_numeric_dtype(col_data):
                 if col_data.count() > 0:  # Only if there are non-null values
-                    column_obj.mean_value = float(col_data.mean())
-                    column_obj.median_value = float(col_data.median())
-                    column_obj.std_value = float(col_data.std()) if col_data.std() == col_data.std() else None  # Check for NaN
-                    column_obj.min_value = float(col_data.min())
-                    column_obj.max_value = float(col_data.max())
+                    fields['mean_value'] = float(col_data.mean())
+                    fields['median_value'] = float(col_data.median())
+                    fields['std_value'] = float(col_data.std()) if col_data.std() == col_data.std() else None  # Check for NaN
+                    fields['min_value'] = float(col_data.min())
+                    fields['max_value'] = float(col_data.max())
             else:
                 # Categorical column statistics
                 if col_data.count() > 0:
                     value_counts = col_data.value_counts()
                     if len(value_counts) > 0:
-                        column_obj.most_frequent_value = str(value_counts.index[0])
-                        column_obj.most_frequent_count = int(value_counts.iloc[0])
+                        fields['most_frequent_value'] = str(value_counts.index[0])
+                        fields['most_frequent_count'] = int(value_counts.iloc[0])
             
-            column_obj.save()
+            column_fields.append(fields)
+        
+        # Count numeric and categorical columns in one pass over the dtypes
+        dtype_counts = cleaned_df.dtypes.astype(str).value_counts()
+        
+        # Dataset, summary and column rows are written in one transaction
+        with transaction.atomic():
+            # Create dataset instance
+            dataset = Dataset.objects.create(
+                name=name,
+                description=description,
+                file_name=file_obj.name,
+                file_size=file_obj.size,
+                file_type='csv',
+                total_rows=len(cleaned_df),
+                total_columns=len(cleaned_df.columns),
+                column_names=list(cleaned_df.columns),
+                column_types=cleaned_df.dtypes.astype(str).to_dict(),
+                is_processed=True
+            )
+            
+            # Create summary statistics
+            summary = SummaryStatistics.objects.create(
+                dataset=dataset,
+                statistics_data=json_stats,
+                numeric_columns_count=int(dtype_counts.get('int64', 0) + dtype_counts.get('float64', 0)),
+                categorical_columns_count=int(dtype_counts.get('object', 0)),
+                missing_values_count=int(cleaned_df.isna().to_numpy().sum()),
+                total_records=len(cleaned_df),
+                avg_flowrate=operational_metrics.get('flowrate', {}).get('average'),
+                avg_pressure=operational_metrics.get('pressure', {}).get('average'),
+                avg_temperature=operational_metrics.get('temperature', {}).get('average'),
+                equipment_type_distribution=make_json_serializable(equipment_analysis.get('equipment_type_distribution', {}))
+            )
+            
+            # Create column records
+            DatasetColumn.objects.bulk_create(
+                [DatasetColumn(dataset=dataset, **fields) for fields in column_fields],
+                batch_size=500
+            )
         
         # Trigger cleanup if needed (history management)
         cleanup_result = trigger_cleanup_if_needed()
@@ -196,6 +239,11 @@ def equipment_csv_upload(request):
             'history_management': cleanup_result
         }
         
+        if request.query_params.get('return') == 'summary':
+            response_data['summary'] = DataSummaryResponseSerializer(
+                build_dataset_summary(dataset, summary)
+            ).data
+        
         return Response(response_data, status=status.HTTP_201_CREATED)
         
     except ValidationError as e:
@@ -235,26 +283,7 @@ def data_summary(request, dataset_id=None):
                 dataset = Dataset.objects.get(id=dataset_id, is_processed=True)
                 summary = dataset.summary
                 
-                # Prepare detailed response
-                response_data = {
-                    'total_record_count': summary.total_records,
-                    'average_flowrate': summary.avg_flowrate,
-                    'average_pressure': summary.avg_pressure,
-                    'average_temperature': summary.avg_temperature,
-                    'equipment_type_distribution': summary.equipment_type_distribution,
-                    'operational_metrics': summary.statistics_data.get('operational_metrics', {}),
-                    'data_quality': summary.statistics_data.get('data_quality', {}),
-                    'equipment_analysis': summary.statistics_data.get('equipment_analysis', {}),
-                    'dataset_info': {
-                        'id': dataset.id,
-                        'name': dataset.name,
-                        'description': dataset.description,
-                        'upload_date': dataset.upload_date,
-                        'total_rows': dataset.total_rows,
-                        'total_columns': dataset.total_columns
-                    },
-                    'analysis_timestamp': summary.updated_date
-                }
+                response_data = build_dataset_summary(dataset, summary)
                 
                 serializer = DataSummaryResponseSerializer(response_data)
                 return Response(serializer.data, status=status.HTTP_200_OK)
@@ -334,8 +363,12 @@ def validate_csv(request):
     API endpoint for validating CSV structure without uploading
     
     POST /api/equipment/validate/
+    POST /api/equipment/validate/?mode=header
     
-    Returns validation results and data preview
+    Returns validation results and data preview. With mode=header only the
+    first line of the file is read, so clients can send just the header line
+    to check a file before uploading it; a header missing required columns
+    is rejected with 400.
     """
     try:
         if 'file' not in request.FILES:
@@ -350,10 +383,15 @@ def validate_csv(request):
                 'error': 'Only CSV files are supported'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Read CSV for validation
-        df = pd.read_csv(file_obj)
+        header_only = request.query_params.get('mode') == 'header'
         
-        if df.empty:
+        # Read CSV for validation; header mode stops after the first line
+        if header_only:
+            df = pd.read_csv(BytesIO(next(iter(file_obj), b'')))
+        else:
+            df = pd.read_csv(file_obj)
+        
+        if df.empty and not header_only:
             return Response({
                 'error': 'CSV file is empty'
             }, status=status.HTTP_400_BAD_REQUEST)
@@ -363,7 +401,7 @@ def validate_csv(request):
         
         # Get data preview if validation passes
         preview_data = None
-        if validation_result['is_valid']:
+        if validation_result['is_valid'] and not header_only:
             cleaned_df = clean_and_validate_data(df, validation_result['column_mapping'])
             preview_data = get_equipment_data_preview(cleaned_df, rows=5)
         
@@ -377,7 +415,7 @@ def validate_csv(request):
             'file_info': {
                 'filename': file_obj.name,
                 'size': file_obj.size,
-                'rows': len(df),
+                'rows': None if header_only else len(df),
                 'columns': len(df.columns)
             }
         }
@@ -385,6 +423,9 @@ def validate_csv(request):
         if preview_data:
             response_data['data_preview'] = preview_data
         
+        if header_only and not validation_result['is_valid']:
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+        
         return Response(response_data, status=status.HTTP_200_OK)
         
     except pd.errors.EmptyDataError:
@@ -411,7 +452,7 @@ def equipment_data_preview(request, dataset_id):
     GET /api/equipment/preview/{dataset_id}/
     """
     try:
-        dataset = Dataset.objects.get(id=dataset_id, is_processed=True)
+        dataset = Dataset.objects.select_related('summary').get(id=dataset_id, is_processed=True)
         
         # This is a simplified preview since we don't store raw data
         # In a real implementation, you might want to store sample data or re-read the file
@@ -166,14 +166,15 @@ def dataset_history(request):
                 'file_size': dataset.file_size
             }
             
-            # Add summary info if available
-            if hasattr(dataset, 'summary') and dataset.summary:
+            # Add summary info if available (already loaded by select_related)
+            summary = getattr(dataset, 'summary', None)
+            if summary is not None:
                 dataset_info['summary'] = {
-                    'total_records': dataset.summary.total_records,
-                    'avg_flowrate': dataset.summary.avg_flowrate,
-                    'avg_pressure': dataset.summary.avg_pressure,
-                    'avg_temperature': dataset.summary.avg_temperature,
-                    'equipment_types': len(dataset.summary.equipment_type_distribution) if dataset.summary.equipment_type_distribution else 0
+                    'total_records': summary.total_records,
+                    'avg_flowrate': summary.avg_flowrate,
+                    'avg_pressure': summary.avg_pressure,
+                    'avg_temperature': summary.avg_temperature,
+                    'equipment_types': len(summary.equipment_type_distribution) if summary.equipment_type_distribution else 0
                 }
             
             dataset_list.append(dataset_info)
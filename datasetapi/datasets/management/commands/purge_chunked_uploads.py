@@ -0,0 +1,27 @@
+"""
+Remove chunked uploads that expired before they were completed
+
+Expired uploads are otherwise only discarded when a client asks for them
+again, so abandoned partial files stay on disk. Run this periodically.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from datasets.chunked_upload_views import discard_upload
+from datasets.models import ChunkedUpload
+
+
+class Command(BaseCommand):
+    help = 'Delete expired chunked uploads and their partial files'
+
+    def handle(self, *args, **options):
+        expired = ChunkedUpload.objects.filter(
+            created_date__lt=timezone.now() - settings.CHUNKED_UPLOAD_EXPIRATION
+        )
+        purged = 0
+        for upload in expired:
+            discard_upload(upload)
+            purged += 1
+
+        self.stdout.write(f'Purged {purged} expired chunked upload(s)')
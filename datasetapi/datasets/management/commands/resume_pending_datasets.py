@@ -0,0 +1,31 @@
+"""
+Finish datasets left pending when the background workers stopped
+
+Work queued on the processing pool is lost on restart. Run this at startup,
+before the server accepts uploads, to process every pending dataset whose
+stored upload still exists and to mark the rest as failed.
+"""
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from datasets.models import Dataset
+from datasets.tasks import process_dataset
+
+
+class Command(BaseCommand):
+    help = 'Process pending datasets whose background job was lost'
+
+    def handle(self, *args, **options):
+        pending = Dataset.objects.filter(is_processed=False, processing_error__isnull=True)
+        resumed = failed = 0
+
+        for dataset in pending.only('id', 'upload_path'):
+            if dataset.upload_path and default_storage.exists(dataset.upload_path):
+                process_dataset(dataset.pk, dataset.upload_path)
+                resumed += 1
+            else:
+                dataset.processing_error = 'Upload was lost before it could be processed'
+                dataset.save(update_fields=['processing_error'])
+                failed += 1
+
+        self.stdout.write(f'Resumed {resumed} pending dataset(s), marked {failed} as failed')
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datasets', '0002_summarystatistics_avg_flowrate_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='summarystatistics',
+            name='last_processed_bytes',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='summarystatistics',
+            name='running_totals',
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-16 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datasets', '0004_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='file_sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
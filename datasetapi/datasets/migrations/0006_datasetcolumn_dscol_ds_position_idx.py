@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-16 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datasets', '0005_dataset_file_sha256'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='datasetcolumn',
+            index=models.Index(fields=['dataset', 'position'], name='dscol_ds_position_idx'),
+        ),
+    ]
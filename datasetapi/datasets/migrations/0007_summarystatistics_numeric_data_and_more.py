@@ -0,0 +1,64 @@
+# Generated by Django 4.2.7 on 2026-10-16 13:05
+
+from django.db import migrations, models
+
+
+# Copied from datasets.models so later changes there do not alter this migration
+def split_column_summaries(statistics_data):
+    """
+    Split the per-column statistics into numeric and categorical summaries
+    
+    Returns:
+        tuple: (numeric, categorical) dicts keyed by column name
+    """
+    numeric_stats = {}
+    categorical_stats = {}
+    for col_name, col_stats in statistics_data.get('columns', {}).items():
+        col_type = col_stats.get('type')
+        if col_type in ('int64', 'float64', 'numeric'):
+            numeric_stats[col_name] = {
+                'mean': col_stats.get('mean'),
+                'median': col_stats.get('median'),
+                'std': col_stats.get('std'),
+                'min': col_stats.get('min'),
+                'max': col_stats.get('max'),
+                'count': col_stats.get('count'),
+                'missing': col_stats.get('missing_count', 0)
+            }
+        elif col_type in ('object', 'category', 'string'):
+            categorical_stats[col_name] = {
+                'unique_count': col_stats.get('unique_count'),
+                'most_frequent': col_stats.get('most_frequent'),
+                'frequency': col_stats.get('frequency'),
+                'missing': col_stats.get('missing_count', 0)
+            }
+    return numeric_stats, categorical_stats
+
+
+def populate_column_summaries(apps, schema_editor):
+    SummaryStatistics = apps.get_model('datasets', 'SummaryStatistics')
+    summaries = SummaryStatistics.objects.only('statistics_data')
+    for summary in summaries.iterator(chunk_size=200):
+        summary.numeric_data, summary.categorical_data = split_column_summaries(summary.statistics_data)
+        summary.save(update_fields=['numeric_data', 'categorical_data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datasets', '0006_datasetcolumn_dscol_ds_position_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='summarystatistics',
+            name='categorical_data',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name='summarystatistics',
+            name='numeric_data',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.RunPython(populate_column_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-16 17:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datasets', '0007_summarystatistics_numeric_data_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='upload_path',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
 import json
+import uuid
 
 
 class Dataset(models.Model):
@@ -11,6 +12,7 @@ class Dataset(models.Model):
     file_name = models.CharField(max_length=255)
     file_size = models.BigIntegerField()  # Size in bytes
     file_type = models.CharField(max_length=50)  # csv, json, xlsx, etc.
+    file_sha256 = models.CharField(max_length=64, blank=True, db_index=True)  # Hex digest of the uploaded file
     upload_date = models.DateTimeField(auto_now_add=True)
     updated_date = models.DateTimeField(auto_now=True)
     
@@ -23,6 +25,7 @@ class Dataset(models.Model):
     # Processing status
     is_processed = models.BooleanField(default=False)
     processing_error = models.TextField(blank=True, null=True)
+    upload_path = models.CharField(max_length=255, blank=True)  # Stored upload awaiting background processing
     
     class Meta:
         ordering = ['-upload_date']
@@ -31,6 +34,37 @@ class Dataset(models.Model):
         return f"{self.name} ({self.file_name})"
 
 
+def split_column_summaries(statistics_data):
+    """
+    Split the per-column statistics into numeric and categorical summaries
+    
+    Returns:
+        tuple: (numeric, categorical) dicts keyed by column name
+    """
+    numeric_stats = {}
+    categorical_stats = {}
+    for col_name, col_stats in statistics_data.get('columns', {}).items():
+        col_type = col_stats.get('type')
+        if col_type in ('int64', 'float64', 'numeric'):
+            numeric_stats[col_name] = {
+                'mean': col_stats.get('mean'),
+                'median': col_stats.get('median'),
+                'std': col_stats.get('std'),
+                'min': col_stats.get('min'),
+                'max': col_stats.get('max'),
+                'count': col_stats.get('count'),
+                'missing': col_stats.get('missing_count', 0)
+            }
+        elif col_type in ('object', 'category', 'string'):
+            categorical_stats[col_name] = {
+                'unique_count': col_stats.get('unique_count'),
+                'most_frequent': col_stats.get('most_frequent'),
+                'frequency': col_stats.get('frequency'),
+                'missing': col_stats.get('missing_count', 0)
+            }
+    return numeric_stats, categorical_stats
+
+
 class SummaryStatistics(models.Model):
     """Model for storing summary statistics for each dataset"""
     
@@ -39,6 +73,10 @@ class SummaryStatistics(models.Model):
     # Basic statistics
     statistics_data = models.JSONField(default=dict)  # Complete statistics as JSON
     
+    # Numeric/categorical partitions of statistics_data, kept in sync on save
+    numeric_data = models.JSONField(default=dict)
+    categorical_data = models.JSONField(default=dict)
+    
     # Quick access fields for common statistics
     numeric_columns_count = models.IntegerField(default=0)
     categorical_columns_count = models.IntegerField(default=0)
@@ -51,6 +89,10 @@ class SummaryStatistics(models.Model):
     avg_temperature = models.FloatField(null=True, blank=True)
     equipment_type_distribution = models.JSONField(default=dict)
     
+    # Running totals for incremental updates of append-only CSV files
+    last_processed_bytes = models.BigIntegerField(default=0)  # CSV bytes already summarized
+    running_totals = models.JSONField(default=dict)  # CSV header, SHA-256 of processed bytes, per-metric sums and counts
+    
     # Timestamps
     created_date = models.DateTimeField(auto_now_add=True)
     updated_date = models.DateTimeField(auto_now=True)
@@ -65,34 +107,16 @@ class SummaryStatistics(models.Model):
         """Get statistics for a specific column"""
         return self.statistics_data.get('columns', {}).get(column_name, {})
     
-    def get_numeric_summary(self):
-        """Get summary of all numeric columns"""
-        numeric_stats = {}
-        for col_name, col_stats in self.statistics_data.get('columns', {}).items():
-            if col_stats.get('type') in ['int64', 'float64', 'numeric']:
-                numeric_stats[col_name] = {
-                    'mean': col_stats.get('mean'),
-                    'median': col_stats.get('median'),
-                    'std': col_stats.get('std'),
-                    'min': col_stats.get('min'),
-                    'max': col_stats.get('max'),
-                    'count': col_stats.get('count'),
-                    'missing': col_stats.get('missing_count', 0)
-                }
-        return numeric_stats
-    
-    def get_categorical_summary(self):
-        """Get summary of all categorical columns"""
-        categorical_stats = {}
-        for col_name, col_stats in self.statistics_data.get('columns', {}).items():
-            if col_stats.get('type') in ['object', 'category', 'string']:
-                categorical_stats[col_name] = {
-                    'unique_count': col_stats.get('unique_count'),
-                    'most_frequent': col_stats.get('most_frequent'),
-                    'frequency': col_stats.get('frequency'),
-                    'missing': col_stats.get('missing_count', 0)
-                }
-        return categorical_stats
+    def save(self, *args, **kwargs):
+        self.numeric_data, self.categorical_data = split_column_summaries(self.statistics_data)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            # updated_date versions the cached statistics responses
+            update_fields = {*update_fields, 'updated_date'}
+            if 'statistics_data' in update_fields:
+                update_fields |= {'numeric_data', 'categorical_data'}
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
 
 
 class DatasetColumn(models.Model):
@@ -120,17 +144,47 @@ class DatasetColumn(models.Model):
     most_frequent_value = models.TextField(null=True, blank=True)
     most_frequent_count = models.IntegerField(null=True, blank=True)
     
+    NUMERIC_TYPES = ('int64', 'float64', 'int32', 'float32')
+    CATEGORICAL_TYPES = ('object', 'category', 'string')
+    
     class Meta:
         ordering = ['position']
         unique_together = ['dataset', 'name']
+        indexes = [
+            # Per-dataset lookups already come back in column order
+            models.Index(fields=['dataset', 'position'], name='dscol_ds_position_idx'),
+        ]
     
     def __str__(self):
         return f"{self.dataset.name} - {self.name} ({self.data_type})"
     
     @property
     def is_numeric(self):
-        return self.data_type in ['int64', 'float64', 'int32', 'float32']
+        return self.data_type in self.NUMERIC_TYPES
     
     @property
     def is_categorical(self):
-        return self.data_type in ['object', 'category', 'string']
\ No newline at end of file
+        return self.data_type in self.CATEGORICAL_TYPES
+
+
+class ChunkedUpload(models.Model):
+    """Model for an upload received in Content-Range chunks until completed"""
+    
+    upload_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    file_name = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()  # Size in bytes announced by the client
+    offset = models.BigIntegerField(default=0)  # Bytes received so far
+    created_date = models.DateTimeField(auto_now_add=True)
+    updated_date = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.file_name} ({self.offset}/{self.total_size} bytes)"
+    
+    @property
+    def storage_path(self):
+        """Path of the partial file in default_storage"""
+        return f"chunks/{self.upload_id}.part"
+    
+    @property
+    def is_complete(self):
+        return self.offset >= self.total_size
\ No newline at end of file
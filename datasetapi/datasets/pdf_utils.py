@@ -15,8 +15,51 @@ from io import BytesIO
 import os
 import logging
 
+from .models import DatasetColumn
+
 logger = logging.getLogger(__name__)
 
+# Fields fetched per column for the column analysis table
+COLUMN_ANALYSIS_FIELDS = (
+    'name', 'data_type', 'non_null_count', 'unique_count',
+    'mean_value', 'min_value', 'max_value',
+    'most_frequent_value', 'most_frequent_count'
+)
+
+
+def _format_numeric_stats(stats):
+    """Format (mean, min, max, ...) values of a numeric column"""
+    mean_value, min_value, max_value = stats[0], stats[1], stats[2]
+    stats_info = []
+    if mean_value is not None:
+        stats_info.append(f"Mean: {mean_value:.2f}")
+    if min_value is not None and max_value is not None:
+        stats_info.append(f"Range: {min_value:.2f} - {max_value:.2f}")
+    return "; ".join(stats_info)
+
+
+def _format_categorical_stats(stats):
+    """Format (..., most_frequent_value, most_frequent_count) values of a categorical column"""
+    most_frequent_value, most_frequent_count = stats[3], stats[4]
+    stats_info = []
+    if most_frequent_value:
+        stats_info.append(f"Most frequent: {most_frequent_value}")
+    if most_frequent_count:
+        stats_info.append(f"Count: {most_frequent_count}")
+    return "; ".join(stats_info)
+
+
+def _format_no_stats(stats):
+    """Fallback for columns that are neither numeric nor categorical"""
+    return ""
+
+
+# Column data type -> statistics formatter
+STATS_FORMATTERS = {
+    **dict.fromkeys(DatasetColumn.NUMERIC_TYPES, _format_numeric_stats),
+    **dict.fromkeys(DatasetColumn.CATEGORICAL_TYPES, _format_categorical_stats),
+}
+
 
 class DatasetPDFGenerator:
     """
@@ -102,14 +145,15 @@ class DatasetPDFGenerator:
             self._add_dataset_overview(story, dataset)
             
             # Add operational metrics (if available)
-            if hasattr(dataset, 'summary'):
-                self._add_operational_metrics(story, dataset.summary)
+            summary = getattr(dataset, 'summary', None)
+            if summary is not None:
+                self._add_operational_metrics(story, summary)
                 
                 # Add equipment analysis
-                self._add_equipment_analysis(story, dataset.summary)
+                self._add_equipment_analysis(story, summary)
                 
                 # Add data quality metrics
-                self._add_data_quality_metrics(story, dataset.summary)
+                self._add_data_quality_metrics(story, summary)
                 
                 # Add column analysis
                 self._add_column_analysis(story, dataset)
@@ -123,7 +167,7 @@ class DatasetPDFGenerator:
             # Save to file if path provided
             if output_path:
                 with open(output_path, 'wb') as f:
-                    f.write(buffer.getvalue())
+                    f.write(buffer.getbuffer())
             
             buffer.seek(0)
             return buffer
@@ -356,7 +400,7 @@ class DatasetPDFGenerator:
     
     def _add_column_analysis(self, story, dataset):
         """Add detailed column analysis"""
-        columns = dataset.columns.all().order_by('position')
+        columns = dataset.columns.order_by('position').values_list(*COLUMN_ANALYSIS_FIELDS)
         if not columns:
             return
         
@@ -367,27 +411,15 @@ class DatasetPDFGenerator:
         # Column details table
         column_data = [['Column', 'Type', 'Non-Null', 'Unique', 'Statistics']]
         
-        for col in columns:
-            stats_info = []
-            
-            if col.is_numeric:
-                if col.mean_value is not None:
-                    stats_info.append(f"Mean: {col.mean_value:.2f}")
-                if col.min_value is not None and col.max_value is not None:
-                    stats_info.append(f"Range: {col.min_value:.2f} - {col.max_value:.2f}")
-            elif col.is_categorical:
-                if col.most_frequent_value:
-                    stats_info.append(f"Most frequent: {col.most_frequent_value}")
-                if col.most_frequent_count:
-                    stats_info.append(f"Count: {col.most_frequent_count}")
-            
-            stats_text = "; ".join(stats_info) if stats_info else "N/A"
+        for name, data_type, non_null_count, unique_count, *stats in columns:
+            formatter = STATS_FORMATTERS.get(data_type, _format_no_stats)
+            stats_text = formatter(stats) or "N/A"
             
             column_data.append([
-                col.name,
-                col.data_type,
-                str(col.non_null_count),
-                str(col.unique_count),
+                name,
+                data_type,
+                str(non_null_count),
+                str(unique_count),
                 stats_text
             ])
         
@@ -5,7 +5,7 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.http import HttpResponse, Http404
+from django.http import FileResponse, Http404
 from django.shortcuts import get_object_or_404
 from django.conf import settings
 import os
@@ -30,10 +30,12 @@ def generate_pdf_report(request, dataset_id):
     """
     try:
         # Get the dataset
-        dataset = get_object_or_404(Dataset, id=dataset_id, is_processed=True)
+        dataset = get_object_or_404(
+            Dataset.objects.select_related('summary'), id=dataset_id, is_processed=True
+        )
         
         # Check if dataset has summary statistics
-        if not hasattr(dataset, 'summary'):
+        if getattr(dataset, 'summary', None) is None:
             return Response({
                 'error': 'Dataset does not have summary statistics available',
                 'dataset_id': dataset_id
@@ -42,13 +44,13 @@ def generate_pdf_report(request, dataset_id):
         # Generate PDF report
         pdf_buffer, filename = generate_dataset_pdf_report(dataset)
         
-        # Create HTTP response with PDF
-        response = HttpResponse(
-            pdf_buffer.getvalue(),
+        # Stream the PDF buffer; FileResponse sets Content-Length from it
+        response = FileResponse(
+            pdf_buffer,
+            as_attachment=True,
+            filename=filename,
             content_type='application/pdf'
         )
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        response['Content-Length'] = len(pdf_buffer.getvalue())
         
         logger.info(f"Generated PDF report for dataset {dataset_id}: {filename}")
         
@@ -82,10 +84,12 @@ def preview_pdf_report(request, dataset_id):
     """
     try:
         # Get the dataset
-        dataset = get_object_or_404(Dataset, id=dataset_id, is_processed=True)
+        dataset = get_object_or_404(
+            Dataset.objects.select_related('summary'), id=dataset_id, is_processed=True
+        )
         
         # Check if dataset has summary statistics
-        if not hasattr(dataset, 'summary'):
+        if getattr(dataset, 'summary', None) is None:
             return Response({
                 'error': 'Dataset does not have summary statistics available',
                 'dataset_id': dataset_id
@@ -226,9 +230,9 @@ def batch_generate_reports(request):
         
         for dataset_id in dataset_ids:
             try:
-                dataset = Dataset.objects.get(id=dataset_id, is_processed=True)
+                dataset = Dataset.objects.select_related('summary').get(id=dataset_id, is_processed=True)
                 
-                if not hasattr(dataset, 'summary'):
+                if getattr(dataset, 'summary', None) is None:
                     results.append({
                         'dataset_id': dataset_id,
                         'status': 'failed',
@@ -244,7 +248,7 @@ def batch_generate_reports(request):
                     'dataset_id': dataset_id,
                     'status': 'success',
                     'filename': filename,
-                    'size_bytes': len(pdf_buffer.getvalue()),
+                    'size_bytes': pdf_buffer.getbuffer().nbytes,
                     'download_url': f'/api/reports/pdf/{dataset_id}/'
                 })
                 successful_count += 1
@@ -0,0 +1,35 @@
+"""
+Response renderers
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+# orjson is optional; without it responses use DRF's stdlib json encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed
+
+    Values orjson does not know (Decimal, lazy strings, ...) go through DRF's
+    encoder, and indented output falls back to the stdlib renderer. Unlike
+    DRF's strict mode, NaN and infinite floats render as null instead of
+    raising.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        return orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+        )
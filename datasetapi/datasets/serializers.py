@@ -1,7 +1,27 @@
-from rest_framework import serializers
+import os
+
+from django.conf import settings
+from rest_framework import exceptions, serializers, status
 from .models import Dataset, SummaryStatistics, DatasetColumn
 
 
+ALLOWED_UPLOAD_EXTENSIONS = frozenset({'.csv', '.json', '.xlsx', '.xls'})
+
+
+class UploadTooLarge(exceptions.APIException):
+    """413 response for uploads over settings.MAX_UPLOAD_BYTES, as chunked uploads return"""
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_code = 'upload_too_large'
+
+
+def validate_upload_size(value):
+    """Reject files larger than settings.MAX_UPLOAD_BYTES"""
+    if value.size > settings.MAX_UPLOAD_BYTES:
+        raise UploadTooLarge(
+            f"File size cannot exceed {settings.MAX_UPLOAD_BYTES // (1024 * 1024)}MB"
+        )
+
+
 class DatasetColumnSerializer(serializers.ModelSerializer):
     """Serializer for dataset columns"""
     
@@ -32,18 +52,40 @@ class SummaryStatisticsSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_date', 'updated_date']
     
     def get_numeric_summary(self, obj):
-        return obj.get_numeric_summary()
+        return obj.numeric_data
     
     def get_categorical_summary(self, obj):
-        return obj.get_categorical_summary()
+        return obj.categorical_data
 
 
 class DatasetSerializer(serializers.ModelSerializer):
-    """Serializer for datasets"""
+    """
+    Serializer for datasets
+    
+    When a request is in the context, the nested summary and columns are
+    only included if asked for with ?include=summary,columns.
+    """
+    
+    NESTED_FIELDS = ('summary', 'columns')
     
     summary = SummaryStatisticsSerializer(read_only=True)
     columns = DatasetColumnSerializer(many=True, read_only=True)
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None:
+            includes = self.requested_includes(request)
+            for field_name in self.NESTED_FIELDS:
+                if field_name not in includes:
+                    self.fields.pop(field_name, None)
+    
+    @classmethod
+    def requested_includes(cls, request):
+        """Nested fields named in the request's include query parameter"""
+        include = request.query_params.get('include', '')
+        return {name.strip() for name in include.split(',')} & set(cls.NESTED_FIELDS)
+    
     class Meta:
         model = Dataset
         fields = [
@@ -81,16 +123,14 @@ class DatasetUploadSerializer(serializers.Serializer):
     
     def validate_file(self, value):
         """Validate uploaded file"""
-        # Check file size (10MB limit)
-        if value.size > 10 * 1024 * 1024:
-            raise serializers.ValidationError("File size cannot exceed 10MB")
+        # Check file size before anything reads the contents
+        validate_upload_size(value)
         
         # Check file extension
-        allowed_extensions = ['.csv', '.json', '.xlsx', '.xls']
-        file_extension = value.name.lower().split('.')[-1]
-        if f'.{file_extension}' not in allowed_extensions:
+        file_extension = os.path.splitext(value.name)[1].lower()
+        if file_extension not in ALLOWED_UPLOAD_EXTENSIONS:
             raise serializers.ValidationError(
-                f"File type not supported. Allowed types: {', '.join(allowed_extensions)}"
+                f"File type not supported. Allowed types: {', '.join(sorted(ALLOWED_UPLOAD_EXTENSIONS))}"
             )
         
         return value
@@ -0,0 +1,16 @@
+"""
+Removal of the stored files of deleted datasets
+"""
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Dataset
+from .tasks import enqueue_dataset_cleanup
+from .utils import dataset_parquet_path
+
+
+@receiver(post_delete, sender=Dataset)
+def remove_dataset_files(sender, instance, **kwargs):
+    """Remove the Parquet copy of a deleted dataset off the request thread"""
+    enqueue_dataset_cleanup(dataset_parquet_path(instance))
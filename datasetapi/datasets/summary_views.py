@@ -4,13 +4,60 @@ Provides comprehensive data summaries using Pandas calculations
 """
 
 import pandas as pd
+import numpy as np
+import hashlib
 import os
+import warnings
+from collections import Counter, defaultdict
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, quote_etag
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from .models import Dataset, SummaryStatistics
 from .serializers import DataSummarySerializer
+from .utils import HASH_CHUNK_SIZE, dataset_parquet_path
+
+# Seconds a computed summary stays cached; keys include the CSV mtime and
+# size, so a modified file always misses the cache
+SUMMARY_CACHE_TIMEOUT = 3600
+
+# Rows parsed per chunk when summarizing a CSV file
+CSV_CHUNK_SIZE = 100_000
+
+# Possible column names (case-insensitive) for each summary metric
+METRIC_COLUMN_NAMES = {
+    'flowrate': ['flowrate', 'flow_rate', 'flow', 'rate'],
+    'pressure': ['pressure', 'press', 'psi', 'bar'],
+    'temperature': ['temperature', 'temp', 'celsius', 'fahrenheit']
+}
+
+# Possible column names (case-insensitive) for the equipment type
+EQUIPMENT_COLUMN_NAMES = ['equipment_type', 'equipment', 'type', 'device_type', 'machine_type']
+
+
+def make_etag(*parts):
+    """Build a quoted ETag from the values a response depends on"""
+    return quote_etag(hashlib.sha256(':'.join(map(str, parts)).encode()).hexdigest())
+
+
+def is_not_modified(request, etag):
+    """Check whether the client's If-None-Match already matches etag"""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return '*' in etags or etag in etags
+
+
+def with_validators(response, etag, last_modified=None):
+    """Set the ETag and Last-Modified headers of a response"""
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
 
 
 @api_view(['GET'])
@@ -36,51 +83,82 @@ def data_summary_api(request, dataset_id):
                 'message': 'Please wait for dataset processing to complete'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Load CSV data using Pandas
+        # Load CSV data using Pandas; an up-to-date Parquet copy is preferred
+        # since only the summary columns have to be read from it
         csv_path = os.path.join(settings.MEDIA_ROOT, 'datasets', dataset.file_name)
+        parquet_path = dataset_parquet_path(dataset)
         
-        if not os.path.exists(csv_path):
+        data_path = csv_path
+        if os.path.exists(parquet_path) and (
+                not os.path.exists(csv_path)
+                or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)):
+            data_path = parquet_path
+        
+        if not os.path.exists(data_path):
             return Response({
                 'error': 'Dataset file not found',
                 'message': 'The original CSV file is no longer available'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        # Read CSV with Pandas
-        try:
-            df = pd.read_csv(csv_path)
-        except Exception as e:
-            return Response({
-                'error': 'Failed to read CSV file',
-                'message': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
-        # Calculate summary data using Pandas
-        summary_data = calculate_data_summary(df)
-        
-        # Store/update summary in database
-        summary_stats, created = SummaryStatistics.objects.get_or_create(
-            dataset=dataset,
-            defaults={
-                'total_records': summary_data['total_records'],
-                'avg_flowrate': summary_data['averages'].get('flowrate'),
-                'avg_pressure': summary_data['averages'].get('pressure'),
-                'avg_temperature': summary_data['averages'].get('temperature'),
-                'equipment_type_distribution': summary_data['equipment_type_distribution']
-            }
-        )
+        # Serve repeated requests without re-reading an unchanged file
+        file_stat = os.stat(data_path)
+        mtime = file_stat.st_mtime
+        cache_key = f"dsum:{dataset_id}:{file_stat.st_mtime_ns}:{file_stat.st_size}"
         
-        if not created:
-            # Update existing summary
-            summary_stats.total_records = summary_data['total_records']
-            summary_stats.avg_flowrate = summary_data['averages'].get('flowrate')
-            summary_stats.avg_pressure = summary_data['averages'].get('pressure')
-            summary_stats.avg_temperature = summary_data['averages'].get('temperature')
-            summary_stats.equipment_type_distribution = summary_data['equipment_type_distribution']
-            summary_stats.save()
+        # The summary only depends on the file, so clients polling an
+        # unchanged file get a 304 without the summary being loaded at all
+        etag = make_etag(cache_key)
+        if is_not_modified(request, etag):
+            return with_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, mtime)
+        
+        summary_data = cache.get(cache_key)
+        
+        if summary_data is None:
+            summary_stats = SummaryStatistics.objects.filter(dataset=dataset).first()
+            
+            # Stored summary is current if it was written after the file changed
+            # (total_records stays 0 until a summary has actually been computed)
+            if (summary_stats is not None and summary_stats.total_records
+                    and mtime <= summary_stats.updated_date.timestamp()):
+                summary_data = summary_from_statistics(summary_stats)
+            else:
+                # Read CSV with Pandas in chunks and calculate the summary;
+                # rows appended since the last run are merged into stored totals
+                try:
+                    if data_path == parquet_path:
+                        summary_data, running_state = calculate_data_summary_from_parquet(
+                            parquet_path
+                        )
+                    else:
+                        summary_data, running_state = calculate_data_summary_from_csv(
+                            csv_path, summary_stats
+                        )
+                except Exception as e:
+                    return Response({
+                        'error': 'Failed to read CSV file',
+                        'message': str(e)
+                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                
+                # Store/update summary in database
+                SummaryStatistics.objects.update_or_create(
+                    dataset=dataset,
+                    defaults={
+                        'total_records': summary_data['total_records'],
+                        'avg_flowrate': summary_data['averages'].get('flowrate'),
+                        'avg_pressure': summary_data['averages'].get('pressure'),
+                        'avg_temperature': summary_data['averages'].get('temperature'),
+                        'equipment_type_distribution': summary_data['equipment_type_distribution'],
+                        **running_state
+                    }
+                )
+            
+            cache.set(cache_key, summary_data, SUMMARY_CACHE_TIMEOUT)
         
         # Serialize and return response
         serializer = DataSummarySerializer(summary_data)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return with_validators(
+            Response(serializer.data, status=status.HTTP_200_OK), etag, mtime
+        )
         
     except Dataset.DoesNotExist:
         return Response({
@@ -95,12 +173,60 @@ def data_summary_api(request, dataset_id):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-def calculate_data_summary(df):
+def summary_from_statistics(summary_stats):
+    """
+    Build the data summary from stored SummaryStatistics fields
+    
+    Args:
+        summary_stats (SummaryStatistics): Previously computed summary
+        
+    Returns:
+        dict: Summary data in the same shape as calculate_data_summary
+    """
+    return {
+        'total_records': summary_stats.total_records,
+        'averages': {
+            'flowrate': summary_stats.avg_flowrate,
+            'pressure': summary_stats.avg_pressure,
+            'temperature': summary_stats.avg_temperature
+        },
+        'equipment_type_distribution': summary_stats.equipment_type_distribution or {}
+    }
+
+
+def resolve_target_columns(columns):
+    """
+    Find the columns holding the summary metrics and the equipment type
+    
+    Args:
+        columns (iterable): Column names, e.g. a CSV header
+        
+    Returns:
+        dict: Maps 'flowrate', 'pressure', 'temperature' and 'equipment'
+        to the matching column name; metrics without a match are omitted
+    """
+    # Lowercased column name -> actual column name (first occurrence wins)
+    col_lower = {}
+    for col in columns:
+        col_lower.setdefault(str(col).lower(), col)
+    
+    target_columns = {}
+    for metric, possible_names in {**METRIC_COLUMN_NAMES, 'equipment': EQUIPMENT_COLUMN_NAMES}.items():
+        column_found = next((col_lower[name] for name in possible_names if name in col_lower), None)
+        if column_found is not None:
+            target_columns[metric] = column_found
+    
+    return target_columns
+
+
+def calculate_data_summary(df, target_columns=None):
     """
     Calculate data summary using Pandas
     
     Args:
         df (pandas.DataFrame): The dataset DataFrame
+        target_columns (dict): Optional result of resolve_target_columns;
+            resolved from df.columns when omitted
         
     Returns:
         dict: Summary data including total records, averages, and equipment distribution
@@ -120,56 +246,46 @@ def calculate_data_summary(df):
     
     # 2. Calculate averages for flowrate, pressure, temperature
     # Handle different possible column names (case-insensitive)
-    target_columns = {
-        'flowrate': ['flowrate', 'flow_rate', 'flow', 'rate'],
-        'pressure': ['pressure', 'press', 'psi', 'bar'],
-        'temperature': ['temperature', 'temp', 'celsius', 'fahrenheit']
+    if target_columns is None:
+        target_columns = resolve_target_columns(df.columns)
+    
+    found = {
+        metric: target_columns[metric]
+        for metric in METRIC_COLUMN_NAMES
+        if metric in target_columns
     }
     
-    for metric, possible_names in target_columns.items():
-        column_found = None
-        
-        # Find matching column (case-insensitive)
-        for col in df.columns:
-            if col.lower() in [name.lower() for name in possible_names]:
-                column_found = col
-                break
-        
-        if column_found is not None:
-            try:
-                # Convert to numeric, handling invalid values gracefully
-                numeric_series = pd.to_numeric(df[column_found], errors='coerce')
-                
-                # Calculate average, excluding NaN values
-                if not numeric_series.isna().all():
-                    avg_value = numeric_series.mean()
-                    summary['averages'][metric] = round(float(avg_value), 2)
-                    
-            except Exception as e:
-                print(f"Error calculating average for {metric}: {e}")
-                summary['averages'][metric] = None
+    if found:
+        try:
+            # Convert to numeric, handling invalid values gracefully, and
+            # average all metric columns in one pass (NaN values excluded)
+            values = np.column_stack([
+                pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64)
+                for column in found.values()
+            ])
+            with warnings.catch_warnings():
+                # All-NaN columns give NaN, which is reported as None below
+                warnings.simplefilter('ignore', RuntimeWarning)
+                means = np.nanmean(values, axis=0)
+            summary['averages'].update({
+                metric: round(float(mean), 2)
+                for metric, mean in zip(found, means)
+                if not np.isnan(mean)
+            })
+        except Exception as e:
+            print(f"Error calculating averages: {e}")
     
     # 3. Equipment type distribution
-    # Look for equipment type column (case-insensitive)
-    equipment_columns = ['equipment_type', 'equipment', 'type', 'device_type', 'machine_type']
-    equipment_column = None
-    
-    for col in df.columns:
-        if col.lower() in [name.lower() for name in equipment_columns]:
-            equipment_column = col
-            break
+    equipment_column = target_columns.get('equipment')
     
     if equipment_column is not None:
         try:
-            # Get value counts for equipment types
-            equipment_counts = df[equipment_column].value_counts()
+            # Get value counts for equipment types, excluding NaN values
+            equipment_counts = df[equipment_column].dropna().astype(str).value_counts()
+            summary['equipment_type_distribution'] = dict(zip(
+                equipment_counts.index.tolist(), equipment_counts.values.tolist()
+            ))
             
-            # Convert to dictionary, handling NaN values
-            summary['equipment_type_distribution'] = {}
-            for equipment_type, count in equipment_counts.items():
-                if pd.notna(equipment_type):  # Exclude NaN values
-                    summary['equipment_type_distribution'][str(equipment_type)] = int(count)
-                    
         except Exception as e:
             print(f"Error calculating equipment distribution: {e}")
             summary['equipment_type_distribution'] = {}
@@ -177,6 +293,195 @@ def calculate_data_summary(df):
     return summary
 
 
+def _sum_and_count(series):
+    """
+    Sum and count the numeric values of a Series, ignoring NaN
+    
+    Columns that are already numeric skip the to_numeric coercion and are
+    reduced straight from their float64 array.
+    """
+    if not pd.api.types.is_numeric_dtype(series):
+        series = pd.to_numeric(series, errors='coerce')
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = ~np.isnan(values)
+    return float(values.sum(where=valid)), int(np.count_nonzero(valid))
+
+
+def _hash_range(csv_file, digest, start, end):
+    """Feed bytes start..end of an open file into digest"""
+    csv_file.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        data = csv_file.read(min(HASH_CHUNK_SIZE, remaining))
+        if not data:
+            break
+        digest.update(data)
+        remaining -= len(data)
+    return digest
+
+
+def _resume_digest(csv_file, header, summary_stats):
+    """
+    Check whether the CSV only had rows appended since summary_stats was stored
+    
+    The header must be unchanged, the file must not have shrunk, the last
+    processed byte must end a line, and the SHA-256 of the processed bytes
+    must match the one stored with the running totals, so rewritten rows
+    are never merged into stale totals.
+    
+    Returns:
+        The SHA-256 hash object of the processed bytes, ready to be updated
+        with the appended ones, or None if the file must be read in full
+    """
+    if summary_stats is None or not summary_stats.last_processed_bytes:
+        return None
+    running_totals = summary_stats.running_totals
+    if running_totals.get('header') != header or not running_totals.get('prefix_sha256'):
+        return None
+    
+    offset = summary_stats.last_processed_bytes
+    if os.fstat(csv_file.fileno()).st_size < offset:
+        return None
+    
+    csv_file.seek(offset - 1)
+    if csv_file.read(1) != b'\n':
+        return None
+    
+    digest = _hash_range(csv_file, hashlib.sha256(), 0, offset)
+    if digest.hexdigest() != running_totals['prefix_sha256']:
+        return None
+    return digest
+
+
+def calculate_data_summary_from_csv(csv_path, summary_stats=None, chunksize=CSV_CHUNK_SIZE):
+    """
+    Calculate the data summary of a CSV file without loading it all at once
+    
+    Only the metric and equipment columns are parsed. Each chunk adds its
+    record count, per-metric sums and non-null counts, and equipment type
+    counts to running totals, so memory use is bounded by the chunk size.
+    
+    If summary_stats holds running totals for this file and rows have only
+    been appended since (checked against a SHA-256 of the processed bytes),
+    parsing starts at the last processed byte and the new rows are merged
+    into the stored totals.
+    
+    Args:
+        csv_path (str): Path of the CSV file
+        summary_stats (SummaryStatistics): Previously stored summary, if any
+        chunksize (int): Rows parsed per chunk
+        
+    Returns:
+        tuple: (summary data in the same shape as calculate_data_summary,
+        dict of last_processed_bytes/running_totals to store)
+    """
+    header = [str(col) for col in pd.read_csv(csv_path, nrows=0).columns]
+    target_columns = resolve_target_columns(header)
+    usecols = list(dict.fromkeys(target_columns.values())) or header[:1]
+    
+    metric_columns = {
+        metric: target_columns[metric]
+        for metric in METRIC_COLUMN_NAMES
+        if metric in target_columns
+    }
+    equipment_column = target_columns.get('equipment')
+    dtype = {equipment_column: 'category'} if equipment_column is not None else None
+    
+    with open(csv_path, 'rb') as csv_file:
+        prefix_digest = _resume_digest(csv_file, header, summary_stats)
+        if prefix_digest is not None:
+            start_offset = summary_stats.last_processed_bytes
+            total_records = summary_stats.total_records
+            sums = defaultdict(float, summary_stats.running_totals.get('sums', {}))
+            counts = defaultdict(int, summary_stats.running_totals.get('counts', {}))
+            equipment_counts = Counter(summary_stats.equipment_type_distribution)
+            
+            # Parse only the appended bytes, supplying the known header
+            csv_file.seek(start_offset)
+            has_new_rows = csv_file.peek(1) != b''
+            read_kwargs = {'header': None, 'names': header}
+        else:
+            prefix_digest = hashlib.sha256()
+            start_offset = 0
+            total_records = 0
+            sums = defaultdict(float)
+            counts = defaultdict(int)
+            equipment_counts = Counter()
+            
+            csv_file.seek(0)
+            has_new_rows = True
+            read_kwargs = {}
+        
+        if has_new_rows:
+            chunks = pd.read_csv(
+                csv_file, usecols=usecols, dtype=dtype, chunksize=chunksize, **read_kwargs
+            )
+            for chunk in chunks:
+                total_records += len(chunk)
+                
+                for metric, column in metric_columns.items():
+                    column_sum, column_count = _sum_and_count(chunk[column])
+                    sums[metric] += column_sum
+                    counts[metric] += column_count
+                
+                if equipment_column is not None:
+                    equipment_counts.update(chunk[equipment_column].value_counts().to_dict())
+        
+        processed_bytes = os.fstat(csv_file.fileno()).st_size
+        _hash_range(csv_file, prefix_digest, start_offset, processed_bytes)
+    
+    summary = {
+        'total_records': total_records,
+        'averages': {
+            metric: round(sums[metric] / counts[metric], 2) if counts[metric] else None
+            for metric in METRIC_COLUMN_NAMES
+        },
+        'equipment_type_distribution': {
+            str(equipment_type): int(count)
+            for equipment_type, count in equipment_counts.most_common()
+            if count
+        }
+    }
+    running_state = {
+        'last_processed_bytes': processed_bytes,
+        'running_totals': {
+            'header': header,
+            'prefix_sha256': prefix_digest.hexdigest(),
+            'sums': dict(sums),
+            'counts': dict(counts)
+        }
+    }
+    return summary, running_state
+
+
+def calculate_data_summary_from_parquet(parquet_path):
+    """
+    Calculate the data summary of a dataset's Parquet copy
+    
+    Only the metric and equipment columns are read from the file. Requires
+    pyarrow, which is only needed once a Parquet copy has been written.
+    
+    Args:
+        parquet_path (str): Path of the Parquet file
+        
+    Returns:
+        tuple: (summary data in the same shape as calculate_data_summary,
+        dict of last_processed_bytes/running_totals to store)
+    """
+    import pyarrow.parquet as pq
+    
+    header = pq.read_schema(parquet_path).names
+    target_columns = resolve_target_columns(header)
+    columns = list(dict.fromkeys(target_columns.values())) or header[:1]
+    
+    df = pd.read_parquet(parquet_path, columns=columns)
+    summary = calculate_data_summary(df, target_columns)
+    
+    # No CSV byte offset to resume from
+    running_state = {'last_processed_bytes': 0, 'running_totals': {}}
+    return summary, running_state
+
+
 @api_view(['GET'])
 def dataset_summary_list(request):
     """
@@ -185,7 +490,26 @@ def dataset_summary_list(request):
     Returns summaries for all processed datasets
     """
     try:
-        summaries = SummaryStatistics.objects.select_related('dataset').all()
+        # One aggregate query tells whether anything in the list has changed
+        state = SummaryStatistics.objects.aggregate(
+            count=Count('id'),
+            last_updated=Max('updated_date'),
+            last_dataset_update=Max('dataset__updated_date')
+        )
+        etag = make_etag(state['count'], state['last_updated'], state['last_dataset_update'])
+        last_modified = state['last_updated'].timestamp() if state['last_updated'] else None
+        
+        if is_not_modified(request, etag):
+            return with_validators(
+                Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified
+            )
+        
+        # Only the scalar fields used below; skips the large statistics_data JSON
+        summaries = SummaryStatistics.objects.select_related('dataset').only(
+            'total_records', 'avg_flowrate', 'avg_pressure', 'avg_temperature',
+            'equipment_type_distribution', 'updated_date',
+            'dataset__id', 'dataset__name'
+        ).iterator(chunk_size=200)
         
         response_data = []
         for summary in summaries:
@@ -202,10 +526,10 @@ def dataset_summary_list(request):
                 'last_updated': summary.updated_date.isoformat()
             })
         
-        return Response({
+        return with_validators(Response({
             'count': len(response_data),
             'summaries': response_data
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_200_OK), etag, last_modified)
         
     except Exception as e:
         return Response({
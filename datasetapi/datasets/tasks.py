@@ -0,0 +1,79 @@
+"""
+Background dataset processing
+
+Uploads sent with ?async=true are stored and processed on a small thread
+pool, so the request returns as soon as the file has been saved. Files of
+deleted datasets are removed on the same pool.
+
+Queued work does not survive a restart; the resume_pending_datasets
+management command finishes (or fails) datasets that were left pending.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+
+from .models import Dataset
+from .utils import dataset_parquet_path, process_pending_dataset
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.DATASET_PROCESSING_WORKERS,
+    thread_name_prefix='dataset-processing'
+)
+
+
+def process_dataset(dataset_id, file_path):
+    """
+    Process a stored upload and record any failure on the dataset
+
+    Args:
+        dataset_id (int): Pending Dataset ID
+        file_path (str): Path of the stored upload in default_storage
+    """
+    try:
+        dataset = Dataset.objects.get(pk=dataset_id)
+        try:
+            with default_storage.open(file_path, 'rb') as file_obj:
+                process_pending_dataset(dataset, file_obj)
+        except Exception as e:
+            logger.exception(f"Processing dataset {dataset_id} failed")
+            Dataset.objects.filter(pk=dataset_id).update(processing_error=str(e))
+        finally:
+            default_storage.delete(file_path)
+            # Deleted while it was processed: its Parquet copy has no row left
+            if not Dataset.objects.filter(pk=dataset_id).update(upload_path=''):
+                cleanup_dataset_files(dataset_parquet_path(dataset))
+    except Dataset.DoesNotExist:
+        # Deleted before it was processed
+        default_storage.delete(file_path)
+    finally:
+        close_old_connections()
+
+
+def enqueue_dataset_processing(dataset_id, file_path):
+    """Schedule process_dataset once the current transaction commits"""
+    transaction.on_commit(
+        lambda: _executor.submit(process_dataset, dataset_id, file_path)
+    )
+
+
+def cleanup_dataset_files(parquet_path):
+    """Remove the Parquet copy of a deleted dataset"""
+    try:
+        if os.path.exists(parquet_path):
+            os.remove(parquet_path)
+    except Exception:
+        logger.exception(f"Removing {parquet_path} failed")
+
+
+def enqueue_dataset_cleanup(parquet_path):
+    """Schedule cleanup_dataset_files once the current transaction commits"""
+    transaction.on_commit(
+        lambda: _executor.submit(cleanup_dataset_files, parquet_path)
+    )
@@ -1,3 +1,591 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+import pandas as pd
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .models import ChunkedUpload, Dataset, DatasetColumn, SummaryStatistics
+from .renderers import FastJSONRenderer, orjson
+from .summary_views import calculate_data_summary_from_csv
+from . import tasks
+from .utils import (
+    HAS_PYARROW, dataset_parquet_path, generate_summary_statistics, process_pending_dataset,
+    read_csv_file, write_parquet_copy
+)
+
+
+class GenerateSummaryStatisticsTests(SimpleTestCase):
+    def test_column_counts_match_select_dtypes(self):
+        df = pd.DataFrame({
+            'count': [1, 2, 3],
+            'active': [True, False, True],
+            'label': ['a', 'b', 'c'],
+        })
+
+        summary = generate_summary_statistics(df)['summary']
+
+        self.assertEqual(summary['numeric_columns_count'], 1)
+        self.assertEqual(summary['categorical_columns_count'], 1)
+
+
+@unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+class ReadCSVFileTests(SimpleTestCase):
+    def assert_dtypes_match_c_engine(self, csv_bytes):
+        df = read_csv_file(BytesIO(csv_bytes))
+        expected = pd.read_csv(BytesIO(csv_bytes))
+        pd.testing.assert_series_equal(df.dtypes, expected.dtypes)
+
+    def test_dtypes_match_c_engine(self):
+        self.assert_dtypes_match_c_engine(
+            b'count,flowrate,label,active,missing\n'
+            b'1,1.5,a,true,\n'
+            b'2,,b,false,3\n'
+        )
+
+    def test_date_and_time_columns_stay_strings(self):
+        self.assert_dtypes_match_c_engine(
+            b'count,measured_at,day,clock,measured_utc\n'
+            b'1,2024-01-01 10:00:00,2024-01-01,12:00:00,2024-01-01T10:00:00Z\n'
+            b'2,2024-01-02 11:00:00,2024-01-02,13:00:00,2024-01-02T10:00:00Z\n'
+        )
+
+
+@unittest.skipIf(orjson is None, 'orjson is not installed')
+class FastJSONRendererTests(SimpleTestCase):
+    def test_datetimes_render_like_drf(self):
+        data = {
+            'utc': datetime(2024, 1, 1, 10, 0, 0, 123456, tzinfo=timezone.utc),
+            'naive': datetime(2024, 1, 1, 10, 0, 0),
+        }
+
+        self.assertEqual(
+            FastJSONRenderer().render(data),
+            JSONRenderer().render(data)
+        )
+        self.assertIn(b'"2024-01-01T10:00:00.123456Z"', FastJSONRenderer().render(data))
+
+
+class IncrementalCSVSummaryTests(SimpleTestCase):
+    HEADER = 'equipment_type,flowrate\n'
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.csv_path = os.path.join(self.tmp_dir, 'equipment.csv')
+
+    def write_csv(self, rows, mode='w'):
+        with open(self.csv_path, mode) as csv_file:
+            if mode == 'w':
+                csv_file.write(self.HEADER)
+            csv_file.writelines(f'{equipment},{flowrate}\n' for equipment, flowrate in rows)
+
+    def summarize(self, previous=None):
+        summary_stats = None
+        if previous is not None:
+            summary, running_state = previous
+            summary_stats = SummaryStatistics(
+                total_records=summary['total_records'],
+                equipment_type_distribution=summary['equipment_type_distribution'],
+                **running_state
+            )
+        return calculate_data_summary_from_csv(self.csv_path, summary_stats)
+
+    def test_appended_rows_are_merged_into_running_totals(self):
+        self.write_csv([('Pump', 100), ('Valve', 200)])
+        first = self.summarize()
+        self.write_csv([('Pump', 300)], mode='a')
+
+        summary, running_state = self.summarize(first)
+
+        self.assertEqual(summary['total_records'], 3)
+        self.assertEqual(summary['averages']['flowrate'], 200.0)
+        self.assertEqual(summary['equipment_type_distribution'], {'Pump': 2, 'Valve': 1})
+        self.assertEqual(running_state['last_processed_bytes'], os.path.getsize(self.csv_path))
+        self.assertEqual(running_state, self.summarize()[1])
+
+    def test_rewrite_of_same_size_is_summarized_from_scratch(self):
+        self.write_csv([('Pump', 100), ('Valve', 200)])
+        first = self.summarize()
+        self.write_csv([('Tank', 500), ('Valve', 700)])
+
+        summary, _ = self.summarize(first)
+
+        self.assertEqual(summary['total_records'], 2)
+        self.assertEqual(summary['averages']['flowrate'], 600.0)
+        self.assertEqual(summary['equipment_type_distribution'], {'Tank': 1, 'Valve': 1})
+
+    def test_rewrite_that_grows_is_not_merged_into_old_totals(self):
+        self.write_csv([('Pump', 100), ('Valve', 200)])
+        first = self.summarize()
+        self.write_csv([('Tank', 500), ('Valve', 700), ('Pump', 900)])
+
+        summary, _ = self.summarize(first)
+
+        self.assertEqual(summary['total_records'], 3)
+        self.assertEqual(summary['averages']['flowrate'], 700.0)
+        self.assertEqual(summary['equipment_type_distribution'], {'Tank': 1, 'Valve': 1, 'Pump': 1})
+
+
+class MediaRootTestCase(TestCase):
+    """TestCase that stores uploads and Parquet copies in a fresh MEDIA_ROOT"""
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+
+
+class ResumePendingDatasetsTests(MediaRootTestCase):
+    def create_pending(self, upload_path):
+        return Dataset.objects.create(
+            name='pending', file_name='pending.csv', file_size=0,
+            file_type='csv', upload_path=upload_path
+        )
+
+    def test_pending_dataset_with_stored_upload_is_processed(self):
+        upload_path = default_storage.save(
+            'uploads/pending.csv', ContentFile(b'equipment_type,flowrate\nPump,100\n')
+        )
+        dataset = self.create_pending(upload_path)
+
+        call_command('resume_pending_datasets', stdout=StringIO())
+
+        dataset.refresh_from_db()
+        self.assertTrue(dataset.is_processed)
+        self.assertEqual(dataset.total_rows, 1)
+        self.assertEqual(dataset.upload_path, '')
+        self.assertFalse(default_storage.exists(upload_path))
+
+    def test_pending_dataset_without_upload_is_marked_failed(self):
+        dataset = self.create_pending('uploads/missing.csv')
+
+        call_command('resume_pending_datasets', stdout=StringIO())
+
+        dataset.refresh_from_db()
+        self.assertFalse(dataset.is_processed)
+        self.assertIsNotNone(dataset.processing_error)
+
+    @unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+    def test_dataset_deleted_while_processing_leaves_no_files(self):
+        upload_path = default_storage.save(
+            'uploads/pending.csv', ContentFile(b'equipment_type,flowrate\nPump,100\n')
+        )
+        dataset = self.create_pending(upload_path)
+
+        def process_then_delete(dataset, file_obj):
+            process_pending_dataset(dataset, file_obj)
+            Dataset.objects.filter(pk=dataset.pk).delete()
+            raise ValueError('dataset went away')
+
+        with mock.patch.object(tasks, 'process_pending_dataset', process_then_delete), \
+                self.assertLogs('datasets.tasks', 'ERROR'):
+            tasks.process_dataset(dataset.pk, upload_path)
+
+        self.assertFalse(default_storage.exists(upload_path))
+        self.assertFalse(os.path.exists(dataset_parquet_path(dataset)))
+
+
+@unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+class DatasetParquetCopyTests(MediaRootTestCase):
+    def create_dataset(self, flowrates, file_name='shared.csv'):
+        """Processed dataset (named shared.csv by default) with its Parquet copy"""
+        df = pd.DataFrame({'flowrate': flowrates})
+        dataset = Dataset.objects.create(
+            name='shared', file_name=file_name, file_size=0, file_type='csv',
+            column_names=['flowrate'], total_rows=len(df), total_columns=1,
+            is_processed=True
+        )
+        write_parquet_copy(df, dataset)
+        return dataset
+
+    def test_preview_reads_copy_of_same_named_dataset(self):
+        first = self.create_dataset([100, 200])
+        second = self.create_dataset([300, 400])
+
+        for dataset, flowrates in ((first, [100, 200]), (second, [300, 400])):
+            response = self.client.get(f'/api/datasets/{dataset.pk}/preview/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([row['flowrate'] for row in response.json()['data']], flowrates)
+
+    def test_download_serves_copy_of_same_named_dataset(self):
+        first = self.create_dataset([100, 200])
+        second = self.create_dataset([300, 400])
+
+        for dataset, flowrates in ((first, [100, 200]), (second, [300, 400])):
+            response = self.client.get(f'/api/datasets/{dataset.pk}/download/')
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('filename="shared.parquet"', response['Content-Disposition'])
+            downloaded = pd.read_parquet(BytesIO(b''.join(response.streaming_content)))
+            self.assertEqual(downloaded['flowrate'].tolist(), flowrates)
+
+    @override_settings(USE_X_ACCEL_REDIRECT=True)
+    def test_accel_download_quotes_file_name(self):
+        dataset = self.create_dataset([100], file_name='pump "A" \u00e9.csv')
+
+        response = self.client.get(f'/api/datasets/{dataset.pk}/download/')
+
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected/datasets/{dataset.pk}.parquet')
+        self.assertEqual(
+            response['Content-Disposition'],
+            "attachment; filename*=utf-8''pump%20%22A%22%20%C3%A9.parquet"
+        )
+
+    def test_delete_removes_only_that_datasets_copy(self):
+        first = self.create_dataset([100, 200])
+        second = self.create_dataset([300, 400])
+
+        # Run the queued cleanup inline so its effect can be checked
+        run_inline = mock.patch.object(tasks._executor, 'submit', side_effect=lambda fn, *args: fn(*args))
+        with run_inline, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/datasets/{first.pk}/delete_dataset/')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertFalse(os.path.exists(dataset_parquet_path(first)))
+        self.assertTrue(os.path.exists(dataset_parquet_path(second)))
+
+
+class ChunkedUploadProtocolTests(MediaRootTestCase):
+    CONTENT = b'equipment_type,flowrate\nPump,100\nValve,200\n'
+
+    def put_chunk(self, url, start, end):
+        chunk = SimpleUploadedFile('equipment.csv', self.CONTENT[start:end + 1])
+        return self.client.put(
+            url, {'file': chunk}, format='multipart',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{len(self.CONTENT)}'
+        )
+
+    def start_upload(self):
+        response = self.put_chunk('/api/datasets/chunked-upload/', 0, 19)
+        self.assertEqual(response.status_code, 200)
+        return f"/api/datasets/chunked-upload/{response.json()['upload_id']}/"
+
+    def stored_bytes(self, upload_url):
+        upload = ChunkedUpload.objects.get(upload_id=upload_url.rstrip('/').rsplit('/', 1)[1])
+        with default_storage.open(upload.storage_path, 'rb') as part_file:
+            return part_file.read()
+
+    def test_chunks_are_assembled_and_completed(self):
+        upload_url = self.start_upload()
+        response = self.put_chunk(upload_url, 20, len(self.CONTENT) - 1)
+        self.assertEqual(response.json()['offset'], len(self.CONTENT))
+        self.assertEqual(self.stored_bytes(upload_url), self.CONTENT)
+
+        response = self.client.post(f'{upload_url}complete/')
+
+        self.assertEqual(response.status_code, 202)
+        dataset = Dataset.objects.get(pk=response.json()['id'])
+        self.assertFalse(ChunkedUpload.objects.exists())
+        self.assertTrue(default_storage.exists(dataset.upload_path))
+
+    def test_retried_complete_creates_one_dataset(self):
+        upload_url = self.start_upload()
+        self.put_chunk(upload_url, 20, len(self.CONTENT) - 1)
+
+        self.assertEqual(self.client.post(f'{upload_url}complete/').status_code, 202)
+        self.assertEqual(self.client.post(f'{upload_url}complete/').status_code, 404)
+        self.assertEqual(Dataset.objects.count(), 1)
+
+    def test_non_string_md5_is_rejected(self):
+        upload_url = self.start_upload()
+        self.put_chunk(upload_url, 20, len(self.CONTENT) - 1)
+
+        response = self.client.post(f'{upload_url}complete/', {'md5': 123}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Dataset.objects.exists())
+
+    def test_rejected_first_chunk_leaves_no_upload(self):
+        chunk = SimpleUploadedFile('equipment.csv', self.CONTENT[:10])
+        response = self.client.put(
+            '/api/datasets/chunked-upload/', {'file': chunk}, format='multipart',
+            HTTP_CONTENT_RANGE=f'bytes 0-19/{len(self.CONTENT)}'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ChunkedUpload.objects.exists())
+
+    def test_chunk_out_of_order_is_rejected(self):
+        upload_url = self.start_upload()
+
+        response = self.put_chunk(upload_url, 30, len(self.CONTENT) - 1)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 20)
+
+    def test_retry_after_lost_offset_update_does_not_duplicate_bytes(self):
+        upload_url = self.start_upload()
+        self.put_chunk(upload_url, 20, 29)
+        # The bytes of 20-29 were written but the offset update was lost
+        ChunkedUpload.objects.update(offset=20)
+
+        self.assertEqual(self.put_chunk(upload_url, 20, 29).status_code, 200)
+        self.put_chunk(upload_url, 30, len(self.CONTENT) - 1)
+
+        self.assertEqual(self.stored_bytes(upload_url), self.CONTENT)
+
+    def test_missing_bytes_reset_the_offset(self):
+        upload_url = self.start_upload()
+        ChunkedUpload.objects.update(offset=30)
+
+        response = self.put_chunk(upload_url, 30, len(self.CONTENT) - 1)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 20)
+
+    def test_expired_upload_is_gone(self):
+        upload_url = self.start_upload()
+        ChunkedUpload.objects.update(created_date=datetime.now(timezone.utc) - timedelta(days=2))
+
+        response = self.client.get(upload_url)
+
+        self.assertEqual(response.status_code, 410)
+        self.assertFalse(ChunkedUpload.objects.exists())
+
+    def test_purge_removes_only_expired_uploads(self):
+        self.start_upload()
+        expired = ChunkedUpload.objects.get()
+        expired.created_date -= timedelta(days=2)
+        expired.save(update_fields=['created_date'])
+        self.start_upload()
+
+        call_command('purge_chunked_uploads', stdout=StringIO())
+
+        self.assertEqual(ChunkedUpload.objects.count(), 1)
+        self.assertFalse(ChunkedUpload.objects.filter(pk=expired.pk).exists())
+        self.assertFalse(default_storage.exists(expired.storage_path))
+
+
+class StatisticsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.dataset = Dataset.objects.create(
+            name='cached', file_name='cached.csv', file_size=0, file_type='csv',
+            is_processed=True
+        )
+        self.summary = SummaryStatistics.objects.create(
+            dataset=self.dataset, statistics_data=self.statistics_data(100.0)
+        )
+
+    def statistics_data(self, mean):
+        return {'columns': {'flowrate': {'type': 'float64', 'mean': mean}}}
+
+    def test_update_invalidates_cached_responses(self):
+        urls = (
+            f'/api/datasets/{self.dataset.pk}/statistics/',
+            f'/api/statistics/{self.summary.pk}/numeric_summary/',
+        )
+        for url in urls:
+            self.client.get(url)
+
+        self.summary.statistics_data = self.statistics_data(250.0)
+        self.summary.save(update_fields=['statistics_data'])
+
+        statistics = self.client.get(urls[0]).json()
+        self.assertEqual(statistics['statistics_data']['columns']['flowrate']['mean'], 250.0)
+        self.assertEqual(self.client.get(urls[1]).json()['flowrate']['mean'], 250.0)
+
+    def test_deleted_summary_is_not_served_from_cache(self):
+        url = f'/api/statistics/{self.summary.pk}/categorical_summary/'
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        SummaryStatistics.objects.filter(pk=self.summary.pk).delete()
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+@override_settings(MAX_UPLOAD_BYTES=16)
+class UploadSizeLimitTests(TestCase):
+    CONTENT = b'equipment_type,flowrate\nPump,100\n'
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def upload(self, url):
+        upload_file = SimpleUploadedFile('equipment.csv', self.CONTENT)
+        return self.client.post(url, {'file': upload_file}, format='multipart')
+
+    def test_oversized_upload_is_rejected_with_413(self):
+        response = self.upload('/api/datasets/upload/')
+
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Dataset.objects.exists())
+
+    def test_oversized_equipment_upload_is_rejected_with_413(self):
+        self.client.force_authenticate(User.objects.create_user('uploader'))
+
+        response = self.upload('/api/equipment/upload/')
+
+        self.assertEqual(response.status_code, 413)
+
+    def test_oversized_chunked_upload_is_rejected_with_413(self):
+        chunk = SimpleUploadedFile('equipment.csv', self.CONTENT[:10])
+        response = self.client.put(
+            '/api/datasets/chunked-upload/', {'file': chunk}, format='multipart',
+            HTTP_CONTENT_RANGE=f'bytes 0-9/{len(self.CONTENT)}'
+        )
+
+        self.assertEqual(response.status_code, 413)
+
+
+class DuplicateUploadTests(MediaRootTestCase):
+    CONTENT = b'equipment_type,flowrate\nPump,100\nValve,200\n'
+
+    def upload(self, name):
+        upload_file = SimpleUploadedFile('equipment.csv', self.CONTENT)
+        return self.client.post(
+            '/api/datasets/upload/', {'file': upload_file, 'name': name}, format='multipart'
+        )
+
+    def test_same_file_twice_returns_flagged_existing_dataset(self):
+        first = self.upload('first')
+        self.assertEqual(first.status_code, 201)
+        self.assertNotIn('is_duplicate', first.json())
+
+        second = self.upload('second')
+
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(second.json()['is_duplicate'])
+        self.assertEqual(second.json()['duplicate_of'], first.json()['id'])
+        self.assertEqual(second.json()['name'], 'first')
+        self.assertEqual(Dataset.objects.count(), 1)
+
+
+class QueryCountTests(TestCase):
+    """Query counts of list endpoints stay constant as datasets are added"""
+
+    DATASET_COUNT = 3
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User(username='reader'))
+        for index in range(self.DATASET_COUNT):
+            dataset = Dataset.objects.create(
+                name=f'dataset {index}', file_name=f'dataset{index}.csv', file_size=0,
+                file_type='csv', is_processed=True
+            )
+            SummaryStatistics.objects.create(
+                dataset=dataset, avg_flowrate=100.0, equipment_type_distribution={'Pump': 1}
+            )
+            DatasetColumn.objects.create(dataset=dataset, name='flowrate', data_type='float64', position=0)
+        self.dataset = dataset
+
+    def assert_queries(self, num, url):
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_dataset_list(self):
+        # COUNT(*) for the paginator, then one page of rows
+        self.assert_queries(2, '/api/datasets/')
+
+    def test_dataset_statistics(self):
+        # Dataset and summary are loaded in one join, cached or not
+        self.assert_queries(1, f'/api/datasets/{self.dataset.pk}/statistics/')
+        self.assert_queries(1, f'/api/datasets/{self.dataset.pk}/statistics/')
+
+    def test_cached_numeric_summary_reads_only_the_row_version(self):
+        url = f'/api/statistics/{self.dataset.summary.pk}/numeric_summary/'
+        self.assert_queries(2, url)
+        self.assert_queries(1, url)
+
+    def test_columns_by_dataset(self):
+        self.assert_queries(1, f'/api/columns/by_dataset/?dataset_id={self.dataset.pk}')
+
+    def test_dataset_history(self):
+        response = self.assert_queries(2, '/api/history/datasets/')
+        self.assertEqual(len(response.json()['datasets']), self.DATASET_COUNT)
+
+    def test_available_reports(self):
+        response = self.assert_queries(1, '/api/reports/available/')
+        self.assertEqual(response.json()['count'], self.DATASET_COUNT)
+
+    def test_history_status(self):
+        # Two counts, oldest and newest dataset, and the cleanup preview's count
+        self.assert_queries(5, '/api/history/status/')
+
+
+class ValidateCSVHeaderTests(TestCase):
+    URL = '/api/equipment/validate/?mode=header'
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def validate(self, content):
+        header_file = SimpleUploadedFile('equipment.csv', content)
+        return self.client.post(self.URL, {'file': header_file}, format='multipart')
+
+    def test_valid_header_is_accepted(self):
+        response = self.validate(b'equipment_id,equipment_type,flowrate,pressure,temperature\n')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['is_valid'])
+        self.assertIsNone(response.json()['file_info']['rows'])
+
+    def test_invalid_header_is_rejected(self):
+        response = self.validate(b'id,type,flow,temp\n')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['is_valid'])
+        self.assertTrue(response.json()['missing_columns'])
+
+    def test_only_the_header_line_is_read(self):
+        response = self.validate(
+            b'equipment_id,equipment_type,flowrate,pressure,temperature\n"unterminated\n'
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+
+class EquipmentUploadSummaryTests(MediaRootTestCase):
+    CONTENT = (
+        b'equipment_id,equipment_type,flowrate,pressure,temperature\n'
+        b'P-1,Pump,100,5.0,80\n'
+        b'V-1,Valve,200,6.5,90\n'
+    )
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(User.objects.create_user('uploader'))
+
+    def upload(self, url):
+        upload_file = SimpleUploadedFile('equipment.csv', self.CONTENT)
+        response = self.client.post(url, {'file': upload_file}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def test_return_summary_matches_summary_endpoint(self):
+        data = self.upload('/api/equipment/upload/?return=summary')
+
+        expected = self.client.get(f"/api/equipment/summary/{data['dataset_id']}/").json()
+        self.assertEqual(data['summary'], expected)
+        self.assertEqual(data['summary']['total_record_count'], 2)
+
+    def test_default_response_keeps_compact_summary(self):
+        data = self.upload('/api/equipment/upload/')
+
+        self.assertEqual(set(data['summary']), {
+            'total_records', 'columns_processed', 'equipment_types_found',
+            'avg_flowrate', 'avg_pressure', 'avg_temperature'
+        })
+        self.assertEqual(data['summary']['total_records'], 2)
+        self.assertEqual(data['status'], 'success')
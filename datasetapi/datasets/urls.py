@@ -16,6 +16,9 @@ from .history_views import (
     history_status, manual_cleanup, cleanup_preview, dataset_history,
     delete_specific_dataset, history_settings
 )
+from .chunked_upload_views import (
+    chunked_upload_start, chunked_upload_detail, chunked_upload_complete
+)
 from .api_root_views import api_root, home_redirect
 
 # Create router and register viewsets
@@ -33,6 +36,11 @@ urlpatterns = [
     path('api/data-summary/<int:dataset_id>/', data_summary_api, name='data-summary-api'),
     path('api/data-summaries/', dataset_summary_list, name='dataset-summary-list'),
     
+    # Resumable chunked uploads (before the router, which would treat them as dataset IDs)
+    path('api/datasets/chunked-upload/', chunked_upload_start, name='chunked-upload-start'),
+    path('api/datasets/chunked-upload/<uuid:upload_id>/', chunked_upload_detail, name='chunked-upload-detail'),
+    path('api/datasets/chunked-upload/<uuid:upload_id>/complete/', chunked_upload_complete, name='chunked-upload-complete'),
+    
     # DRF router URLs
     path('api/', include(router.urls)),
     
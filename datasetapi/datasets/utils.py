@@ -1,22 +1,93 @@
 import pandas as pd
 import numpy as np
+import hashlib
 import json
-from typing import Dict, Any, Tuple
+import logging
+import os
+from datetime import date, time
+from typing import Dict, Any, List, Optional, Tuple
+from django.conf import settings
+from django.db import transaction
 from .models import Dataset, SummaryStatistics, DatasetColumn
 
+logger = logging.getLogger(__name__)
+
+# pyarrow is optional; it enables the multithreaded CSV reader and Parquet copies
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def has_temporal_columns(df: pd.DataFrame) -> bool:
+    """
+    Whether any column holds dates or times, which the Arrow CSV reader
+    infers but the C engine leaves as strings
+    """
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series) or pd.api.types.is_timedelta64_dtype(series):
+            return True
+        if series.dtype == object:
+            first_valid = series.first_valid_index()
+            if first_valid is not None and isinstance(series[first_valid], (date, time)):
+                return True
+    return False
+
+
+def read_csv_file(file_obj) -> pd.DataFrame:
+    """
+    Read a CSV upload, using pandas' multithreaded pyarrow engine when available
+    
+    Falls back to the default C engine for files the Arrow reader rejects, and
+    for files with date or time columns so dtypes match the C engine.
+    """
+    if HAS_PYARROW:
+        try:
+            df = pd.read_csv(file_obj, engine='pyarrow')
+            if not has_temporal_columns(df):
+                return df
+        except Exception:
+            pass
+        file_obj.seek(0)
+    return pd.read_csv(file_obj)
+
+
+# Bytes hashed at a time when fingerprinting an uploaded file
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def hash_file(file_obj, algorithm: str = 'sha256') -> str:
+    """
+    Hex digest of a Django File, read chunk by chunk and rewound afterwards
+    """
+    digest = hashlib.new(algorithm)
+    for chunk in file_obj.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
+def find_duplicate_dataset(file_sha256: str) -> Optional[Dataset]:
+    """
+    Get an already processed dataset uploaded from an identical file
+    """
+    return Dataset.objects.filter(file_sha256=file_sha256, is_processed=True).first()
+
 
 def process_uploaded_file(file_obj, file_name: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     """
     Process uploaded file and return DataFrame and metadata
     """
-    file_extension = file_name.lower().split('.')[-1]
+    file_extension = os.path.splitext(file_name)[1].lower().lstrip('.')
     
     try:
         if file_extension == 'csv':
-            df = pd.read_csv(file_obj)
+            df = read_csv_file(file_obj)
         elif file_extension == 'json':
             df = pd.read_json(file_obj)
-        elif file_extension in ['xlsx', 'xls']:
+        elif file_extension in ('xlsx', 'xls'):
             df = pd.read_excel(file_obj)
         else:
             raise ValueError(f"Unsupported file type: {file_extension}")
@@ -26,7 +97,7 @@ def process_uploaded_file(file_obj, file_name: str) -> Tuple[pd.DataFrame, Dict[
             'total_rows': len(df),
             'total_columns': len(df.columns),
             'column_names': df.columns.tolist(),
-            'column_types': {col: str(df[col].dtype) for col in df.columns}
+            'column_types': df.dtypes.astype(str).to_dict()
         }
         
         return df, metadata
@@ -35,28 +106,43 @@ def process_uploaded_file(file_obj, file_name: str) -> Tuple[pd.DataFrame, Dict[
         raise ValueError(f"Error processing file: {str(e)}")
 
 
-def calculate_column_statistics(series: pd.Series) -> Dict[str, Any]:
+def _float_or_none(value) -> Optional[float]:
+    """Convert a numeric statistic to float, mapping NaN to None"""
+    return float(value) if pd.notna(value) else None
+
+
+def calculate_column_statistics(series: pd.Series, precomputed_missing: Optional[int] = None) -> Dict[str, Any]:
     """
     Calculate comprehensive statistics for a pandas Series
+    
+    precomputed_missing can carry the series' null count when the caller
+    has already computed it for the whole DataFrame.
     """
+    if precomputed_missing is None:
+        missing_count = int(series.isna().sum())
+    else:
+        missing_count = precomputed_missing
     stats = {
         'name': series.name,
         'type': str(series.dtype),
-        'count': int(series.count()),
-        'missing_count': int(series.isnull().sum()),
+        'count': len(series) - missing_count,
+        'missing_count': missing_count,
         'unique_count': int(series.nunique()),
     }
     
     # Numeric statistics
     if pd.api.types.is_numeric_dtype(series):
+        # describe() treats booleans as categorical, so summarize them as 0/1
+        numeric = series.astype(float) if pd.api.types.is_bool_dtype(series) else series
+        described = numeric.describe(percentiles=[0.25, 0.5, 0.75])
         stats.update({
-            'mean': float(series.mean()) if not series.empty else None,
-            'median': float(series.median()) if not series.empty else None,
-            'std': float(series.std()) if not series.empty else None,
-            'min': float(series.min()) if not series.empty else None,
-            'max': float(series.max()) if not series.empty else None,
-            'q25': float(series.quantile(0.25)) if not series.empty else None,
-            'q75': float(series.quantile(0.75)) if not series.empty else None,
+            'mean': _float_or_none(described['mean']),
+            'median': _float_or_none(described['50%']),
+            'std': _float_or_none(described['std']),
+            'min': _float_or_none(described['min']),
+            'max': _float_or_none(described['max']),
+            'q25': _float_or_none(described['25%']),
+            'q75': _float_or_none(described['75%']),
         })
     
     # Categorical statistics
@@ -76,35 +162,102 @@ def generate_summary_statistics(df: pd.DataFrame) -> Dict[str, Any]:
     """
     Generate comprehensive summary statistics for the entire dataset
     """
+    # Null counts are computed once and shared by every statistic below
+    null_per_col = df.isna().sum()
+    total_missing = int(null_per_col.sum())
+    total_cells = len(df) * len(df.columns)
+    
     summary = {
         'dataset_info': {
             'total_rows': len(df),
             'total_columns': len(df.columns),
             'memory_usage': int(df.memory_usage(deep=True).sum()),
-            'missing_values_total': int(df.isnull().sum().sum())
+            'missing_values_total': total_missing
         },
         'columns': {}
     }
     
     # Calculate statistics for each column
     for column in df.columns:
-        summary['columns'][column] = calculate_column_statistics(df[column])
+        summary['columns'][column] = calculate_column_statistics(
+            df[column], precomputed_missing=int(null_per_col[column])
+        )
     
-    # Overall statistics
-    numeric_columns = df.select_dtypes(include=[np.number]).columns
-    categorical_columns = df.select_dtypes(include=['object', 'category']).columns
+    # Overall statistics, counted in one pass over the column dtypes;
+    # booleans are neither numeric nor categorical, as with select_dtypes
+    numeric_columns_count = 0
+    categorical_columns_count = 0
+    for dtype in df.dtypes:
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            numeric_columns_count += 1
+        elif dtype == object or isinstance(dtype, pd.CategoricalDtype):
+            categorical_columns_count += 1
     
     summary['summary'] = {
-        'numeric_columns_count': len(numeric_columns),
-        'categorical_columns_count': len(categorical_columns),
-        'total_missing_values': int(df.isnull().sum().sum()),
-        'missing_percentage': float((df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100)
+        'numeric_columns_count': numeric_columns_count,
+        'categorical_columns_count': categorical_columns_count,
+        'total_missing_values': total_missing,
+        'missing_percentage': float(total_missing / total_cells * 100) if total_cells else 0.0
     }
     
     return summary
 
 
-def create_dataset_from_upload(file_obj, file_name: str, name: str = None, description: str = None) -> Dataset:
+def store_dataset_contents(dataset: Dataset, df: pd.DataFrame, summary_data: Dict[str, Any]) -> Dataset:
+    """
+    Create the summary statistics and column records of a parsed dataset
+    and mark it processed; call inside a transaction
+    """
+    # Create summary statistics
+    SummaryStatistics.objects.create(
+        dataset=dataset,
+        statistics_data=summary_data,
+        numeric_columns_count=summary_data['summary']['numeric_columns_count'],
+        categorical_columns_count=summary_data['summary']['categorical_columns_count'],
+        missing_values_count=summary_data['summary']['total_missing_values']
+    )
+    
+    # Create column records
+    columns = []
+    for idx, column in enumerate(df.columns):
+        col_stats = summary_data['columns'][column]
+        column_fields = {
+            'name': column,
+            'data_type': col_stats['type'],
+            'position': idx,
+            'non_null_count': col_stats['count'],
+            'null_count': col_stats['missing_count'],
+            'unique_count': col_stats['unique_count']
+        }
+        
+        # Add numeric-specific fields
+        if pd.api.types.is_numeric_dtype(df[column]):
+            column_fields.update({
+                'mean_value': col_stats.get('mean'),
+                'median_value': col_stats.get('median'),
+                'std_value': col_stats.get('std'),
+                'min_value': col_stats.get('min'),
+                'max_value': col_stats.get('max')
+            })
+        else:
+            column_fields.update({
+                'most_frequent_value': col_stats.get('most_frequent'),
+                'most_frequent_count': col_stats.get('frequency')
+            })
+        
+        columns.append(DatasetColumn(dataset=dataset, **column_fields))
+    
+    DatasetColumn.objects.bulk_create(columns, batch_size=500)
+    
+    # Mark as processed
+    dataset.is_processed = True
+    dataset.save()
+    
+    return dataset
+
+
+def create_dataset_from_upload(file_obj, file_name: str, name: str = None, description: str = None,
+                               file_sha256: str = '') -> Dataset:
     """
     Create Dataset instance from uploaded file with complete processing
     """
@@ -112,62 +265,31 @@ def create_dataset_from_upload(file_obj, file_name: str, name: str = None, descr
         # Process the file
         df, metadata = process_uploaded_file(file_obj, file_name)
         
-        # Create dataset instance
-        dataset = Dataset.objects.create(
-            name=name or file_name.split('.')[0],
-            description=description or '',
-            file_name=file_name,
-            file_size=file_obj.size,
-            file_type=file_name.lower().split('.')[-1],
-            total_rows=metadata['total_rows'],
-            total_columns=metadata['total_columns'],
-            column_names=metadata['column_names'],
-            column_types=metadata['column_types'],
-            is_processed=False
-        )
-        
         # Generate summary statistics
         summary_data = generate_summary_statistics(df)
         
-        # Create summary statistics
-        summary = SummaryStatistics.objects.create(
-            dataset=dataset,
-            statistics_data=summary_data,
-            numeric_columns_count=summary_data['summary']['numeric_columns_count'],
-            categorical_columns_count=summary_data['summary']['categorical_columns_count'],
-            missing_values_count=summary_data['summary']['total_missing_values']
-        )
+        base_name, file_extension = os.path.splitext(file_name)
         
-        # Create column records
-        for idx, column in enumerate(df.columns):
-            col_stats = summary_data['columns'][column]
-            
-            column_obj = DatasetColumn.objects.create(
-                dataset=dataset,
-                name=column,
-                data_type=col_stats['type'],
-                position=idx,
-                non_null_count=col_stats['count'],
-                null_count=col_stats['missing_count'],
-                unique_count=col_stats['unique_count']
+        # Dataset, summary and column rows are written in one transaction
+        with transaction.atomic():
+            # Create dataset instance
+            dataset = Dataset.objects.create(
+                name=name or base_name,
+                description=description or '',
+                file_name=file_name,
+                file_size=file_obj.size,
+                file_type=file_extension.lower().lstrip('.'),
+                file_sha256=file_sha256,
+                total_rows=metadata['total_rows'],
+                total_columns=metadata['total_columns'],
+                column_names=metadata['column_names'],
+                column_types=metadata['column_types'],
+                is_processed=False
             )
-            
-            # Add numeric-specific fields
-            if pd.api.types.is_numeric_dtype(df[column]):
-                column_obj.mean_value = col_stats.get('mean')
-                column_obj.median_value = col_stats.get('median')
-                column_obj.std_value = col_stats.get('std')
-                column_obj.min_value = col_stats.get('min')
-                column_obj.max_value = col_stats.get('max')
-            else:
-                column_obj.most_frequent_value = col_stats.get('most_frequent')
-                column_obj.most_frequent_count = col_stats.get('frequency')
-            
-            column_obj.save()
+            store_dataset_contents(dataset, df, summary_data)
         
-        # Mark as processed
-        dataset.is_processed = True
-        dataset.save()
+        # Columnar copy lets the summary API read only the columns it needs
+        write_parquet_copy(df, dataset)
         
         return dataset
         
@@ -179,6 +301,117 @@ def create_dataset_from_upload(file_obj, file_name: str, name: str = None, descr
         raise e
 
 
+def create_pending_dataset(file_obj, file_name: str, name: str = None, description: str = None,
+                           file_sha256: str = '', upload_path: str = '') -> Dataset:
+    """
+    Create an unprocessed Dataset for an upload that is processed later
+    """
+    base_name, file_extension = os.path.splitext(file_name)
+    return Dataset.objects.create(
+        name=name or base_name,
+        description=description or '',
+        file_name=file_name,
+        file_size=file_obj.size,
+        file_type=file_extension.lower().lstrip('.'),
+        file_sha256=file_sha256,
+        upload_path=upload_path,
+        is_processed=False
+    )
+
+
+def process_pending_dataset(dataset: Dataset, file_obj) -> Dataset:
+    """
+    Parse the stored file of a pending dataset and fill in its metadata,
+    summary statistics and column records
+    """
+    df, metadata = process_uploaded_file(file_obj, dataset.file_name)
+    summary_data = generate_summary_statistics(df)
+    
+    with transaction.atomic():
+        dataset.total_rows = metadata['total_rows']
+        dataset.total_columns = metadata['total_columns']
+        dataset.column_names = metadata['column_names']
+        dataset.column_types = metadata['column_types']
+        dataset.processing_error = None
+        store_dataset_contents(dataset, df, summary_data)
+    
+    write_parquet_copy(df, dataset)
+    
+    return dataset
+
+
+def dataset_parquet_path(dataset: Dataset) -> str:
+    """
+    Path of the Parquet copy stored for a dataset
+    
+    Keyed on the primary key, since several datasets can share a file name.
+    """
+    return os.path.join(settings.MEDIA_ROOT, 'datasets', f'{dataset.pk}.parquet')
+
+
+def write_parquet_copy(df: pd.DataFrame, dataset: Dataset) -> Optional[str]:
+    """
+    Store a snappy-compressed Parquet copy of an uploaded dataset
+    
+    Parquet support is optional: returns None when pyarrow is not installed
+    or the frame cannot be written (e.g. mixed-type object columns).
+    """
+    if not HAS_PYARROW:
+        return None
+    
+    parquet_path = dataset_parquet_path(dataset)
+    try:
+        os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+        df.rename(columns=str).to_parquet(
+            parquet_path, engine='pyarrow', compression='snappy', index=False
+        )
+    except Exception as e:
+        logger.warning(f"Writing Parquet copy of dataset {dataset.pk} failed: {e}")
+        return None
+    
+    return parquet_path
+
+
+def read_parquet_head(dataset: Dataset, rows: int) -> Optional[pd.DataFrame]:
+    """
+    Read the first rows of a dataset's Parquet copy without loading the rest
+    
+    Returns None when there is no Parquet copy (or pyarrow is not installed).
+    """
+    parquet_path = dataset_parquet_path(dataset)
+    if not HAS_PYARROW or not os.path.exists(parquet_path):
+        return None
+    
+    import pyarrow.parquet as pq
+    
+    parquet_file = pq.ParquetFile(parquet_path)
+    batch = next(parquet_file.iter_batches(batch_size=rows), None)
+    if batch is None:
+        return parquet_file.schema_arrow.empty_table().to_pandas()
+    return batch.to_pandas()
+
+
+def dataframe_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert a DataFrame to JSON-serializable row dicts
+    
+    Values of numeric columns become floats (None for NaN/inf), everything
+    else becomes str(value) (None for missing values).
+    """
+    numeric_columns = df.select_dtypes(include=[np.number]).columns
+    other_columns = df.columns.difference(numeric_columns, sort=False)
+    
+    numeric_df = df[numeric_columns].astype(float)
+    numeric_df = numeric_df.astype(object).where(np.isfinite(numeric_df), None)
+    
+    other_df = df[other_columns]
+    # str() per value, so e.g. timestamps keep their time part
+    other_df = other_df.map(str).astype(object).where(other_df.notna(), None)
+    
+    records_df = pd.concat([numeric_df, other_df], axis=1)[df.columns]
+    return records_df.to_dict(orient='records')
+
+
 def get_dataset_preview(df: pd.DataFrame, rows: int = 5) -> Dict[str, Any]:
     """
     Get a preview of the dataset (first few rows)
@@ -186,19 +419,7 @@ def get_dataset_preview(df: pd.DataFrame, rows: int = 5) -> Dict[str, Any]:
     preview_df = df.head(rows)
     
     # Convert to JSON-serializable format
-    preview_data = []
-    for _, row in preview_df.iterrows():
-        row_data = {}
-        for col in preview_df.columns:
-            value = row[col]
-            # Handle NaN and other non-serializable values
-            if pd.isna(value):
-                row_data[col] = None
-            elif isinstance(value, (np.integer, np.floating)):
-                row_data[col] = float(value) if np.isfinite(value) else None
-            else:
-                row_data[col] = str(value)
-        preview_data.append(row_data)
+    preview_data = dataframe_to_records(preview_df)
     
     return {
         'columns': preview_df.columns.tolist(),
@@ -2,8 +2,15 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from django.http import JsonResponse
+from django.utils.http import content_disposition_header
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, JsonResponse
+from urllib.parse import quote
+import os
 import pandas as pd
 
 from .models import Dataset, SummaryStatistics, DatasetColumn
@@ -11,7 +18,24 @@ from .serializers import (
     DatasetSerializer, DatasetListSerializer, DatasetUploadSerializer,
     SummaryStatisticsSerializer, DatasetColumnSerializer
 )
-from .utils import create_dataset_from_upload, process_uploaded_file, get_dataset_preview
+from .utils import (
+    create_dataset_from_upload, create_pending_dataset, process_uploaded_file, get_dataset_preview,
+    read_parquet_head, hash_file, find_duplicate_dataset, dataset_parquet_path
+)
+from .tasks import enqueue_dataset_processing
+
+# Seconds a serialized statistics response stays cached
+STATISTICS_CACHE_TIMEOUT = 3600
+
+
+def statistics_cache_key(summary_id, version, view):
+    """
+    Cache key of a statistics response for one version of a SummaryStatistics row
+    
+    The version is the row's updated_date, so a saved summary is never served
+    from an entry cached by any process before the save.
+    """
+    return f"stats:{summary_id}:{version.isoformat()}:{view}"
 
 
 class DatasetViewSet(viewsets.ModelViewSet):
@@ -21,6 +45,15 @@ class DatasetViewSet(viewsets.ModelViewSet):
     queryset = Dataset.objects.all()
     parser_classes = (MultiPartParser, FormParser)
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Load the related rows each detail action reads in the same round-trip
+        if self.action == 'statistics':
+            queryset = queryset.select_related('summary')
+        elif self.action == 'columns':
+            queryset = queryset.prefetch_related('columns')
+        return queryset
+    
     def get_serializer_class(self):
         if self.action == 'list':
             return DatasetListSerializer
@@ -29,18 +62,30 @@ class DatasetViewSet(viewsets.ModelViewSet):
         return DatasetSerializer
     
     def list(self, request):
-        """List all datasets with basic information"""
-        datasets = self.get_queryset()
+        """List all datasets with basic information, one page at a time"""
+        datasets = self.get_queryset().only(*DatasetListSerializer.Meta.fields)
+        page = self.paginate_queryset(datasets)
+        if page is not None:
+            serializer = DatasetListSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
         serializer = DatasetListSerializer(datasets, many=True)
         return Response({
-            'count': datasets.count(),
+            'count': len(serializer.data),
             'results': serializer.data
         })
     
     def retrieve(self, request, pk=None):
         """Get detailed information about a specific dataset"""
-        dataset = get_object_or_404(Dataset, pk=pk)
-        serializer = DatasetSerializer(dataset)
+        includes = DatasetSerializer.requested_includes(request)
+        queryset = Dataset.objects.all()
+        if 'summary' in includes:
+            queryset = queryset.select_related('summary')
+        if 'columns' in includes:
+            queryset = queryset.prefetch_related('columns')
+        
+        dataset = get_object_or_404(queryset, pk=pk)
+        serializer = DatasetSerializer(dataset, context={'request': request})
         return Response(serializer.data)
     
     @action(detail=False, methods=['post'])
@@ -54,12 +99,44 @@ class DatasetViewSet(viewsets.ModelViewSet):
                 name = serializer.validated_data.get('name')
                 description = serializer.validated_data.get('description')
                 
+                # An identical file that was already processed is not processed again;
+                # the existing dataset is returned, flagged so clients can tell
+                file_sha256 = hash_file(file_obj)
+                duplicate = find_duplicate_dataset(file_sha256)
+                if duplicate is not None:
+                    response_data = DatasetSerializer(duplicate).data
+                    response_data.update(is_duplicate=True, duplicate_of=duplicate.pk)
+                    return Response(response_data, status=status.HTTP_200_OK)
+                
+                # ?async=true stores the file and processes it in the background;
+                # poll the dataset until is_processed (or processing_error) is set
+                if request.query_params.get('async', '').lower() in ('1', 'true'):
+                    # The row only commits once the file is stored, and keeps its path
+                    # so resume_pending_datasets can finish it after a restart
+                    with transaction.atomic():
+                        dataset = create_pending_dataset(
+                            file_obj=file_obj,
+                            file_name=file_obj.name,
+                            name=name,
+                            description=description,
+                            file_sha256=file_sha256
+                        )
+                        dataset.upload_path = default_storage.save(
+                            f'uploads/{dataset.pk}_{file_obj.name}', file_obj
+                        )
+                        dataset.save(update_fields=['upload_path'])
+                        enqueue_dataset_processing(dataset.pk, dataset.upload_path)
+                    
+                    response_serializer = DatasetListSerializer(dataset)
+                    return Response(response_serializer.data, status=status.HTTP_202_ACCEPTED)
+                
                 # Create dataset with processing
                 dataset = create_dataset_from_upload(
                     file_obj=file_obj,
                     file_name=file_obj.name,
                     name=name,
-                    description=description
+                    description=description,
+                    file_sha256=file_sha256
                 )
                 
                 # Return the created dataset
@@ -77,7 +154,7 @@ class DatasetViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def statistics(self, request, pk=None):
         """Get detailed statistics for a dataset"""
-        dataset = get_object_or_404(Dataset, pk=pk)
+        dataset = self.get_object()
         
         if not dataset.is_processed:
             return Response(
@@ -85,20 +162,25 @@ class DatasetViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            summary = dataset.summary
-            serializer = SummaryStatisticsSerializer(summary)
-            return Response(serializer.data)
-        except SummaryStatistics.DoesNotExist:
+        # Loaded by select_related in get_queryset; None when missing
+        summary = getattr(dataset, 'summary', None)
+        if summary is None:
             return Response(
                 {'error': 'Statistics not available for this dataset'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
+        
+        data = cache.get_or_set(
+            statistics_cache_key(summary.pk, summary.updated_date, 'statistics'),
+            lambda: SummaryStatisticsSerializer(summary).data,
+            STATISTICS_CACHE_TIMEOUT
+        )
+        return Response(data)
     
     @action(detail=True, methods=['get'])
     def columns(self, request, pk=None):
         """Get detailed information about dataset columns"""
-        dataset = get_object_or_404(Dataset, pk=pk)
+        dataset = self.get_object()
         columns = dataset.columns.all()
         serializer = DatasetColumnSerializer(columns, many=True)
         return Response(serializer.data)
@@ -114,8 +196,17 @@ class DatasetViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # This is a simplified preview - in a real application, 
-        # you might want to store sample data or re-read the file
+        # Rows come from the Parquet copy stored at upload time
+        try:
+            rows = min(max(int(request.query_params.get('rows', 5)), 1), 100)
+        except ValueError:
+            rows = 5
+        
+        preview_df = read_parquet_head(dataset, rows)
+        if preview_df is not None:
+            return Response(get_dataset_preview(preview_df, rows))
+        
+        # Datasets uploaded without a Parquet copy only have their metadata
         return Response({
             'message': 'Preview functionality would require file storage implementation',
             'columns': dataset.column_names,
@@ -123,15 +214,39 @@ class DatasetViewSet(viewsets.ModelViewSet):
             'total_columns': dataset.total_columns
         })
     
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Download the stored Parquet copy of a dataset"""
+        dataset = get_object_or_404(Dataset, pk=pk)
+        parquet_path = dataset_parquet_path(dataset)
+        
+        if not os.path.exists(parquet_path):
+            return Response(
+                {'error': 'No stored copy available for this dataset'}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        download_name = f'{os.path.splitext(dataset.file_name)[0]}.parquet'
+        
+        # Behind nginx the file is sent by the proxy from an internal location
+        if settings.USE_X_ACCEL_REDIRECT:
+            relative_path = os.path.relpath(parquet_path, settings.MEDIA_ROOT).replace(os.sep, '/')
+            response = HttpResponse(content_type='application/octet-stream')
+            response['X-Accel-Redirect'] = f'{settings.PROTECTED_MEDIA_URL}{quote(relative_path)}'
+            response['Content-Disposition'] = content_disposition_header(True, download_name)
+            return response
+        
+        return FileResponse(open(parquet_path, 'rb'), as_attachment=True, filename=download_name)
+    
     @action(detail=True, methods=['delete'])
     def delete_dataset(self, request, pk=None):
         """Delete a dataset and all associated data"""
         dataset = get_object_or_404(Dataset, pk=pk)
-        dataset_name = dataset.name
+        # The Parquet copy is removed by the post_delete signal
         dataset.delete()
         
         return Response({
-            'message': f'Dataset "{dataset_name}" has been deleted successfully'
+            'message': f'Dataset "{dataset.name}" has been deleted successfully'
         }, status=status.HTTP_200_OK)
 
 
@@ -145,14 +260,32 @@ class SummaryStatisticsViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=['get'])
     def numeric_summary(self, request, pk=None):
         """Get summary of numeric columns only"""
-        summary = get_object_or_404(SummaryStatistics, pk=pk)
-        return Response(summary.get_numeric_summary())
+        # Only the row version is read when the response is cached
+        version = get_object_or_404(
+            SummaryStatistics.objects.values_list('updated_date', flat=True), pk=pk
+        )
+        cache_key = statistics_cache_key(pk, version, 'numeric')
+        data = cache.get(cache_key)
+        if data is None:
+            # Read the single precomputed column rather than statistics_data
+            data = SummaryStatistics.objects.values_list('numeric_data', flat=True).get(pk=pk)
+            cache.set(cache_key, data, STATISTICS_CACHE_TIMEOUT)
+        return Response(data)
     
     @action(detail=True, methods=['get'])
     def categorical_summary(self, request, pk=None):
         """Get summary of categorical columns only"""
-        summary = get_object_or_404(SummaryStatistics, pk=pk)
-        return Response(summary.get_categorical_summary())
+        # Only the row version is read when the response is cached
+        version = get_object_or_404(
+            SummaryStatistics.objects.values_list('updated_date', flat=True), pk=pk
+        )
+        cache_key = statistics_cache_key(pk, version, 'categorical')
+        data = cache.get(cache_key)
+        if data is None:
+            # Read the single precomputed column rather than statistics_data
+            data = SummaryStatistics.objects.values_list('categorical_data', flat=True).get(pk=pk)
+            cache.set(cache_key, data, STATISTICS_CACHE_TIMEOUT)
+        return Response(data)
 
 
 class DatasetColumnViewSet(viewsets.ReadOnlyModelViewSet):
@@ -179,6 +312,18 @@ class DatasetColumnViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        columns = DatasetColumn.objects.filter(dataset_id=dataset_id)
-        serializer = DatasetColumnSerializer(columns, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        # Plain rows in DatasetColumnSerializer's shape, without building model instances
+        fields = [
+            field for field in DatasetColumnSerializer.Meta.fields
+            if field not in ('is_numeric', 'is_categorical')
+        ]
+        columns = DatasetColumn.objects.filter(dataset_id=dataset_id).values(*fields)
+        data = [
+            {
+                **column,
+                'is_numeric': column['data_type'] in DatasetColumn.NUMERIC_TYPES,
+                'is_categorical': column['data_type'] in DatasetColumn.CATEGORICAL_TYPES
+            }
+            for column in columns
+        ]
+        return Response(data)
\ No newline at end of file
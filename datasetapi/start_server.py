@@ -7,23 +7,48 @@ import sys
 import subprocess
 from pathlib import Path
 
+# Directory containing manage.py, resolved once for the whole script
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+def list_directory(path):
+    """Return the names of the entries in path from a single directory scan"""
+    with os.scandir(path) as entries:
+        return frozenset(entry.name for entry in entries)
+
+def run_migrations():
+    """Apply database migrations in this process"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'datasetapi.settings')
+    import django
+    from django.core.management import call_command
+    
+    django.setup()
+    call_command('migrate', interactive=False)
+
+def resume_pending_datasets():
+    """Finish background uploads that were pending when the server last stopped"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'datasetapi.settings')
+    import django
+    from django.core.management import call_command
+    
+    django.setup()
+    call_command('resume_pending_datasets')
+
 def check_requirements():
     """Check if all requirements are met"""
     print("🔍 Checking requirements...")
     
-    # Get the directory where this script is located
-    script_dir = Path(__file__).parent
-    os.chdir(script_dir)
+    # One scan answers every existence check below
+    names = list_directory(SCRIPT_DIR)
     
     # Check if migrations are applied
-    if not Path('db.sqlite3').exists():
+    if 'db.sqlite3' not in names:
         print("⚠️  Database not found. Running migrations...")
-        subprocess.run([sys.executable, 'manage.py', 'migrate'], check=True)
+        run_migrations()
         print("✅ Database created successfully!")
     
     # Check for sample data
     sample_files = ['sample_equipment_data.csv', 'sample_data.csv']
-    sample_found = any(Path(f).exists() for f in sample_files)
+    sample_found = any(f in names for f in sample_files)
     
     if not sample_found:
         print("📥 Sample data not found.")
@@ -33,53 +58,61 @@ def check_requirements():
     else:
         print("✅ Sample data found!")
 
+ENDPOINTS_TEXT = """
+🌐 Available API Endpoints:
+   📊 Datasets:
+      GET    /api/datasets/                    - List all datasets
+      POST   /api/datasets/upload/             - Upload new dataset
+      GET    /api/datasets/{id}/               - Get dataset details
+      GET    /api/datasets/{id}/statistics/    - Get dataset statistics
+      GET    /api/datasets/{id}/columns/       - Get column information
+      DELETE /api/datasets/{id}/delete_dataset/ - Delete dataset
+
+   📈 Statistics:
+      GET    /api/statistics/                  - List all statistics
+      GET    /api/statistics/{id}/             - Get specific statistics
+      GET    /api/statistics/{id}/numeric_summary/     - Numeric columns only
+      GET    /api/statistics/{id}/categorical_summary/ - Categorical columns only
+
+   📋 Columns:
+      GET    /api/columns/                     - List all columns
+      GET    /api/columns/?dataset={id}        - Get columns for dataset
+"""
+
+TESTING_COMMANDS_TEXT = """
+🧪 Testing Commands:
+   # Test the setup
+   python test_api.py
+
+   # Demo with sample data
+   python demo_upload.py
+
+   # Upload via curl
+   curl -X POST http://localhost:8000/api/datasets/upload/ \\
+     -F "file=@sample_equipment_data.csv" \\
+     -F "name=Equipment Dataset"
+"""
+
 def show_endpoints():
     """Display available API endpoints"""
-    print("\n🌐 Available API Endpoints:")
-    print("   📊 Datasets:")
-    print("      GET    /api/datasets/                    - List all datasets")
-    print("      POST   /api/datasets/upload/             - Upload new dataset")
-    print("      GET    /api/datasets/{id}/               - Get dataset details")
-    print("      GET    /api/datasets/{id}/statistics/    - Get dataset statistics")
-    print("      GET    /api/datasets/{id}/columns/       - Get column information")
-    print("      DELETE /api/datasets/{id}/delete_dataset/ - Delete dataset")
-    
-    print("\n   📈 Statistics:")
-    print("      GET    /api/statistics/                  - List all statistics")
-    print("      GET    /api/statistics/{id}/             - Get specific statistics")
-    print("      GET    /api/statistics/{id}/numeric_summary/     - Numeric columns only")
-    print("      GET    /api/statistics/{id}/categorical_summary/ - Categorical columns only")
-    
-    print("\n   📋 Columns:")
-    print("      GET    /api/columns/                     - List all columns")
-    print("      GET    /api/columns/?dataset={id}        - Get columns for dataset")
+    sys.stdout.write(ENDPOINTS_TEXT)
 
 def show_testing_commands():
     """Show testing commands"""
-    print("\n🧪 Testing Commands:")
-    print("   # Test the setup")
-    print("   python test_api.py")
-    print("")
-    print("   # Demo with sample data")
-    print("   python demo_upload.py")
-    print("")
-    print("   # Upload via curl")
-    print("   curl -X POST http://localhost:8000/api/datasets/upload/ \\")
-    print("     -F \"file=@sample_equipment_data.csv\" \\")
-    print("     -F \"name=Equipment Dataset\"")
+    sys.stdout.write(TESTING_COMMANDS_TEXT)
 
 def main():
     """Main function"""
     print("🚀 Chemical Equipment Parameter Visualizer API")
     print("=" * 50)
     
-    # Change to the script directory (datasetapi folder)
-    script_dir = Path(__file__).parent
-    original_dir = Path.cwd()
-    os.chdir(script_dir)
-    print(f"📁 Working directory: {Path.cwd()}")
+    # Change to the script directory (datasetapi folder) for manage.py
+    original_dir = os.getcwd()
+    os.chdir(SCRIPT_DIR)
+    print(f"📁 Working directory: {SCRIPT_DIR}")
     
     check_requirements()
+    resume_pending_datasets()
     show_endpoints()
     show_testing_commands()
     
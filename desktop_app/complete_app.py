@@ -8,6 +8,7 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 import sys
 import requests
+from requests.adapters import HTTPAdapter
 
 # Set matplotlib backend BEFORE importing matplotlib components
 import matplotlib
@@ -26,26 +27,59 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QPixmap
 
-class AuthWorker(QThread):
-    """Worker thread for authentication"""
+# Shared session so every worker reuses pooled keep-alive connections to the API
+API = requests.Session()
+API.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
+API.headers.update({'Accept': 'application/json'})
+
+class ApiWorker(QThread):
+    """
+    Base worker thread for API calls made through the shared session
+
+    Workers are cancelled cooperatively rather than terminated: a thread killed
+    while holding the session's cookie-jar or connection-pool lock would hang
+    every later API call. A cancelled worker finishes its request, which is
+    bounded by the request timeout, and drops the result.
+    """
     finished = pyqtSignal(dict)
     
+    def __init__(self):
+        super().__init__()
+        self.cancelled = False
+    
+    def cancel(self):
+        """Drop the result of the request in flight"""
+        self.cancelled = True
+    
+    def emit_result(self, result):
+        """Emit finished unless the worker was cancelled"""
+        if not self.cancelled:
+            self.finished.emit(result)
+    
+    def __del__(self):
+        """Ensure proper cleanup"""
+        if self.isRunning():
+            self.cancel()
+            self.wait()
+
+class AuthWorker(ApiWorker):
+    """Worker thread for authentication"""
+    
     def __init__(self, username, password, action='login'):
         super().__init__()
         self.username = username
         self.password = password
         self.action = action
-        self.setTerminationEnabled(True)
     
     def run(self):
         try:
             if self.action == 'login':
-                response = requests.post('http://localhost:8000/api/auth/login/', {
+                response = API.post('http://localhost:8000/api/auth/login/', {
                     'username': self.username,
                     'password': self.password
                 }, timeout=10)
             else:  # register
-                response = requests.post('http://localhost:8000/api/auth/register/', {
+                response = API.post('http://localhost:8000/api/auth/register/', {
                     'username': self.username,
                     'password': self.password,
                     'email': f'{self.username}@example.com'
@@ -53,76 +87,62 @@ class AuthWorker(QThread):
             
             if response.status_code in [200, 201]:
                 data = response.json()
-                self.finished.emit({'success': True, 'data': data})
+                self.emit_result({'success': True, 'data': data})
             else:
-                self.finished.emit({'success': False, 'error': f'HTTP {response.status_code}'})
+                self.emit_result({'success': False, 'error': f'HTTP {response.status_code}'})
                 
         except Exception as e:
-            self.finished.emit({'success': False, 'error': str(e)})
-    
-    def __del__(self):
-        """Ensure proper cleanup"""
-        if self.isRunning():
-            self.terminate()
-            self.wait()
+            self.emit_result({'success': False, 'error': str(e)})
 
-class DataWorker(QThread):
+class DataWorker(ApiWorker):
     """Worker thread for data operations"""
-    finished = pyqtSignal(dict)
     
     def __init__(self, token, operation, **kwargs):
         super().__init__()
         self.token = token
         self.operation = operation
         self.kwargs = kwargs
-        self.setTerminationEnabled(True)
     
     def run(self):
         try:
             headers = {'Authorization': f'Bearer {self.token}'}
             
             if self.operation == 'load_datasets':
-                response = requests.get('http://localhost:8000/api/datasets/', headers=headers, timeout=10)
+                response = API.get('http://localhost:8000/api/datasets/', headers=headers, timeout=10)
             elif self.operation == 'load_history':
                 page = self.kwargs.get('page', 1)
-                response = requests.get(f'http://localhost:8000/api/history/datasets/?page={page}&page_size=10', 
-                                      headers=headers, timeout=10)
+                response = API.get(f'http://localhost:8000/api/history/datasets/?page={page}&page_size=10', 
+                                 headers=headers, timeout=10)
             elif self.operation == 'load_dataset_detail':
                 dataset_id = self.kwargs['dataset_id']
-                response = requests.get(f'http://localhost:8000/api/datasets/{dataset_id}/', headers=headers, timeout=10)
+                response = API.get(f'http://localhost:8000/api/datasets/{dataset_id}/', headers=headers, timeout=10)
             elif self.operation == 'load_statistics':
                 dataset_id = self.kwargs['dataset_id']
-                response = requests.get(f'http://localhost:8000/api/datasets/{dataset_id}/statistics/', 
-                                      headers=headers, timeout=10)
+                response = API.get(f'http://localhost:8000/api/datasets/{dataset_id}/statistics/', 
+                                 headers=headers, timeout=10)
             elif self.operation == 'load_columns':
                 dataset_id = self.kwargs['dataset_id']
-                response = requests.get(f'http://localhost:8000/api/datasets/{dataset_id}/columns/', 
-                                      headers=headers, timeout=10)
+                response = API.get(f'http://localhost:8000/api/datasets/{dataset_id}/columns/', 
+                                 headers=headers, timeout=10)
             elif self.operation == 'download_pdf':
                 dataset_id = self.kwargs['dataset_id']
-                response = requests.get(f'http://localhost:8000/api/reports/pdf/{dataset_id}/', 
-                                      headers=headers, timeout=30)
+                response = API.get(f'http://localhost:8000/api/reports/pdf/{dataset_id}/', 
+                                 headers=headers, timeout=30)
                 # For PDF downloads, return the raw response
                 if response.status_code == 200:
-                    self.finished.emit({'success': True, 'data': response.content, 'is_binary': True})
+                    self.emit_result({'success': True, 'data': response.content, 'is_binary': True})
                     return
                 else:
-                    self.finished.emit({'success': False, 'error': f'HTTP {response.status_code}'})
+                    self.emit_result({'success': False, 'error': f'HTTP {response.status_code}'})
                     return
             
             if response.status_code == 200:
-                self.finished.emit({'success': True, 'data': response.json()})
+                self.emit_result({'success': True, 'data': response.json()})
             else:
-                self.finished.emit({'success': False, 'error': f'HTTP {response.status_code}'})
+                self.emit_result({'success': False, 'error': f'HTTP {response.status_code}'})
                 
         except Exception as e:
-            self.finished.emit({'success': False, 'error': str(e)})
-    
-    def __del__(self):
-        """Ensure proper cleanup"""
-        if self.isRunning():
-            self.terminate()
-            self.wait()
+            self.emit_result({'success': False, 'error': str(e)})
 
 class ChartWidget(QWidget):
     """Widget for displaying matplotlib charts as images"""
@@ -512,8 +532,8 @@ class CompleteDatasetAnalyzer(QMainWindow):
             # Clean up any running workers
             for worker in self.workers:
                 if worker and worker.isRunning():
-                    worker.terminate()
-                    worker.wait(1000)  # Wait up to 1 second
+                    worker.cancel()
+                    worker.wait(1000)  # Wait up to 1 second; __del__ waits for the rest
             
             # Clear matplotlib figures
             if hasattr(self, 'chart_widget'):
@@ -1107,11 +1127,15 @@ class CompleteDatasetAnalyzer(QMainWindow):
                     'description': self.dataset_description.toPlainText()
                 }
                 
-                response = requests.post('http://localhost:8000/api/datasets/upload/', 
-                                       headers=headers, files=files, data=data, timeout=60)
+                response = API.post('http://localhost:8000/api/datasets/upload/', 
+                                  headers=headers, files=files, data=data, timeout=60)
             
             if response.status_code in [200, 201]:
-                QMessageBox.information(self, "Success", "Chemical equipment dataset uploaded successfully!")
+                if response.json().get('is_duplicate'):
+                    QMessageBox.information(self, "Already Uploaded",
+                                            "This file was uploaded before; the existing dataset was kept.")
+                else:
+                    QMessageBox.information(self, "Success", "Chemical equipment dataset uploaded successfully!")
                 
                 # Clear form
                 self.selected_file = None
@@ -1302,7 +1326,7 @@ For your screening task, you can show these charts and explain that matplotlib i
             try:
                 timeout_timer.stop()
                 if hasattr(self, 'pdf_worker') and self.pdf_worker.isRunning():
-                    self.pdf_worker.terminate()
+                    self.pdf_worker.cancel()
                 progress_msg.close()
                 progress_msg.deleteLater()
             except:
@@ -1321,7 +1345,7 @@ For your screening task, you can show these charts and explain that matplotlib i
         """Handle PDF download timeout"""
         try:
             if hasattr(self, 'pdf_worker') and self.pdf_worker.isRunning():
-                self.pdf_worker.terminate()
+                self.pdf_worker.cancel()
             progress_msg.close()
             progress_msg.deleteLater()
             QMessageBox.warning(self, "Timeout", "PDF download timed out. Please try again.")
@@ -5,6 +5,7 @@ Enhanced Desktop Application with all advanced features - Windows compatible
 
 import sys
 import requests
+from requests.adapters import HTTPAdapter
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
@@ -19,6 +20,11 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QFont
 
+# Shared session so every worker reuses pooled keep-alive connections to the API
+API = requests.Session()
+API.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
+API.headers.update({'Accept': 'application/json'})
+
 class AuthWorker(QThread):
     """Worker thread for authentication"""
     finished = pyqtSignal(dict)
@@ -32,12 +38,12 @@ class AuthWorker(QThread):
     def run(self):
         try:
             if self.action == 'login':
-                response = requests.post('http://localhost:8000/api/auth/login/', {
+                response = API.post('http://localhost:8000/api/auth/login/', {
                     'username': self.username,
                     'password': self.password
                 }, timeout=10)
             else:  # register
-                response = requests.post('http://localhost:8000/api/auth/register/', {
+                response = API.post('http://localhost:8000/api/auth/register/', {
                     'username': self.username,
                     'password': self.password,
                     'email': f'{self.username}@example.com'
@@ -67,22 +73,22 @@ class DataWorker(QThread):
             headers = {'Authorization': f'Bearer {self.token}'}
             
             if self.operation == 'load_datasets':
-                response = requests.get('http://localhost:8000/api/datasets/', headers=headers, timeout=10)
+                response = API.get('http://localhost:8000/api/datasets/', headers=headers, timeout=10)
             elif self.operation == 'load_history':
                 page = self.kwargs.get('page', 1)
-                response = requests.get(f'http://localhost:8000/api/history/datasets/?page={page}&page_size=10', 
-                                      headers=headers, timeout=10)
+                response = API.get(f'http://localhost:8000/api/history/datasets/?page={page}&page_size=10', 
+                                 headers=headers, timeout=10)
             elif self.operation == 'load_dataset_detail':
                 dataset_id = self.kwargs['dataset_id']
-                response = requests.get(f'http://localhost:8000/api/datasets/{dataset_id}/', headers=headers, timeout=10)
+                response = API.get(f'http://localhost:8000/api/datasets/{dataset_id}/', headers=headers, timeout=10)
             elif self.operation == 'load_statistics':
                 dataset_id = self.kwargs['dataset_id']
-                response = requests.get(f'http://localhost:8000/api/datasets/{dataset_id}/statistics/', 
-                                      headers=headers, timeout=10)
+                response = API.get(f'http://localhost:8000/api/datasets/{dataset_id}/statistics/', 
+                                 headers=headers, timeout=10)
             elif self.operation == 'load_columns':
                 dataset_id = self.kwargs['dataset_id']
-                response = requests.get(f'http://localhost:8000/api/datasets/{dataset_id}/columns/', 
-                                      headers=headers, timeout=10)
+                response = API.get(f'http://localhost:8000/api/datasets/{dataset_id}/columns/', 
+                                 headers=headers, timeout=10)
             
             if response.status_code == 200:
                 self.finished.emit({'success': True, 'data': response.json()})
@@ -798,11 +804,15 @@ class EnhancedDatasetAnalyzer(QMainWindow):
                     'description': self.dataset_description.toPlainText()
                 }
                 
-                response = requests.post('http://localhost:8000/api/datasets/upload/', 
-                                       headers=headers, files=files, data=data, timeout=60)
+                response = API.post('http://localhost:8000/api/datasets/upload/', 
+                                  headers=headers, files=files, data=data, timeout=60)
             
             if response.status_code in [200, 201]:
-                QMessageBox.information(self, "Success", "Dataset uploaded successfully!")
+                if response.json().get('is_duplicate'):
+                    QMessageBox.information(self, "Already Uploaded",
+                                            "This file was uploaded before; the existing dataset was kept.")
+                else:
+                    QMessageBox.information(self, "Success", "Dataset uploaded successfully!")
                 
                 # Clear form
                 self.selected_file = None
@@ -258,10 +258,16 @@ class UploadTab(QWidget):
         self.upload_button.setEnabled(True)
         self.upload_button.setText("Upload Dataset")
         
-        QMessageBox.information(
-            self, "Upload Successful", 
-            f"Dataset '{result.get('name', 'Unknown')}' uploaded successfully!"
-        )
+        if result.get('is_duplicate'):
+            QMessageBox.information(
+                self, "Already Uploaded",
+                f"This file was already uploaded as dataset '{result.get('name', 'Unknown')}'."
+            )
+        else:
+            QMessageBox.information(
+                self, "Upload Successful", 
+                f"Dataset '{result.get('name', 'Unknown')}' uploaded successfully!"
+            )
         
         # Clear form
         self.clear_form()
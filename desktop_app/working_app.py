@@ -365,7 +365,11 @@ class DatasetAnalyzerApp(QMainWindow):
                                        headers=headers, files=files, data=data, timeout=30)
             
             if response.status_code in [200, 201]:
-                QMessageBox.information(self, "Success", "Dataset uploaded successfully!")
+                if response.json().get('is_duplicate'):
+                    QMessageBox.information(self, "Already Uploaded",
+                                            "This file was uploaded before; the existing dataset was kept.")
+                else:
+                    QMessageBox.information(self, "Success", "Dataset uploaded successfully!")
                 self.load_datasets()  # Refresh the list
                 self.selected_file = None
                 self.file_label.setText("No file selected")
@@ -88,7 +88,9 @@ const Upload = () => {
         },
       });
 
-      setSuccess('Dataset uploaded successfully!');
+      setSuccess(response.data.is_duplicate
+        ? 'This file was uploaded before; opening the existing dataset.'
+        : 'Dataset uploaded successfully!');
       
       // Reset form
       setFormData({